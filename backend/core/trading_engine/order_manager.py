@@ -55,10 +55,13 @@ class Order:
     strategy_id: Optional[str] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            # 只读一次时钟，新订单的创建与更新时间相同
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
 
 
 class OrderManager:
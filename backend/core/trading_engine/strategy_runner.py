@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime
 from typing import List
 
 import pandas as pd
@@ -160,7 +161,7 @@ class StrategyRunner:
                         "confidence": sig.confidence,
                         "reason": sig.reason,
                     },
-                    timestamp=sig.timestamp,
+                    timestamp=sig.timestamp or datetime.now(),
                     source="strategy_runner",
                 )
             )
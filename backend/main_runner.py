@@ -120,13 +120,14 @@ async def main():
     
     logger = logging.getLogger(__name__)
     
-    # 时间检查和处理
-    now = hours_manager._get_now()
+    # 时间检查和处理：同一时刻的交易状态一次算出
+    snap = hours_manager.snapshot()
+    now = snap.now
     logger.info(f"当前时间: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
     logger.info(f"市场: {market}, 时区: {timezone}")
     
     # 检查是否为交易日
-    if not hours_manager.is_trading_day(now):
+    if not snap.is_trading_day:
         next_open = hours_manager.get_next_open_time()
         logger.warning(f"当前不是交易日（可能是周末或节假日）")
         logger.info(f"下次开盘时间: {next_open.strftime('%Y-%m-%d %H:%M:%S %Z')}")
@@ -134,16 +135,16 @@ async def main():
         return
     
     # 检查是否在交易时间内
-    is_currently_trading = hours_manager.is_trading_time(now)
+    is_currently_trading = snap.is_trading_time
     if is_currently_trading:
         logger.info("当前在交易时间内，服务正常启动")
     else:
         # 不在交易时间内，检查各种情况
-        seconds_until_open = hours_manager.get_seconds_until_open()
+        seconds_until_open = snap.seconds_until_open
         
         if seconds_until_open == 0:
             # 已过今日收盘时间
-            close_time = hours_manager.get_close_time_today()
+            close_time = snap.close_time
             if close_time:
                 auto_stop_time = close_time + timedelta(minutes=auto_stop_after)
                 if now < auto_stop_time:
@@ -157,7 +158,7 @@ async def main():
                 return
         elif seconds_until_open <= 1800:  # 30分钟内
             # 距离开盘30分钟内，等待到开盘前10分钟
-            auto_start_time = hours_manager.get_open_time_today() - timedelta(minutes=auto_start_before)
+            auto_start_time = snap.open_time - timedelta(minutes=auto_start_before)
             if now < auto_start_time:
                 wait_seconds = (auto_start_time - now).total_seconds()
                 logger.info(f"距离开盘还有 {int(seconds_until_open / 60)} 分钟，等待到开盘前{auto_start_before}分钟（{auto_start_time.strftime('%H:%M:%S')}）启动...")
@@ -221,7 +222,7 @@ async def main():
     
     # 启动自动停止任务（如果当前在交易时间内或在收盘后10分钟内）
     auto_stop_task_handle = None
-    close_time = hours_manager.get_close_time_today()
+    close_time = snap.close_time
     if is_currently_trading or (close_time and now < close_time + timedelta(minutes=auto_stop_after)):
         auto_stop_task_handle = asyncio.create_task(auto_stop_task())
     
@@ -818,19 +819,22 @@ async def main():
 
                 def reflect_and_push(entry, price):
                     out = reflect_cb(entry, price)
-                    if push_enable and bots and out and out.get("ai"):
-                        for b in bots:
-                            b.send_markdown(
-                                title="AI 反思",
-                                text_md=(
-                                    f"### AI 反思\n"
-                                    f"- 标的: {entry.symbol}\n"
-                                    f"- 动作: {entry.action}\n"
-                                    f"- 当前价: {price}\n"
-                                    f"- 目标: {entry.targets}\n"
-                                    f"- 输出: {out['ai'].get('output')}\n"
-                                ),
-                            )
+                    # 不推送或AI无输出时直接返回，不拼接Markdown
+                    if not (push_enable and bots and out and out.get("ai")):
+                        return out
+                    ai_output = out["ai"].get("output")
+                    if not ai_output:
+                        return out
+                    text_md = (
+                        f"### AI 反思\n"
+                        f"- 标的: {entry.symbol}\n"
+                        f"- 动作: {entry.action}\n"
+                        f"- 当前价: {price}\n"
+                        f"- 目标: {entry.targets}\n"
+                        f"- 输出: {ai_output}\n"
+                    )
+                    for b in bots:
+                        b.send_markdown(title="AI 反思", text_md=text_md)
                     return out
 
                 journal.refresh_progress(get_last_price, reflect_and_push)
@@ -4,7 +4,10 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import pandas as pd
@@ -22,11 +25,8 @@ class Signal:
     price: Optional[float] = None
     confidence: float = 1.0
     reason: str = ""
-    timestamp: datetime = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    # 不在构造时取系统时间：回测可传入K线时间，未指定时由消费方在读取时补齐
+    timestamp: Optional[datetime] = None
 
 
 class BaseStrategy(ABC):
@@ -36,8 +36,11 @@ class BaseStrategy(ABC):
         self.name = name
         self.config = config or {}
         self.is_running = False
-        self.positions: Dict[str, float] = {}
-        self.signals: List[Signal] = []
+        # 持仓按列存储：标的只在首次出现时登记一次编号，之后按整数下标更新
+        self._symbol_ids: Dict[str, int] = {}
+        self._position_qty = array("d")
+        # 有界环形缓冲：长时间运行时只保留最近的信号
+        self.signals: Deque[Signal] = deque(maxlen=int(self.config.get("signal_history", 10000)))
         self.performance_metrics: Dict[str, float] = {}
         
         logger.info(f"初始化策略: {name}")
@@ -84,13 +87,26 @@ class BaseStrategy(ABC):
     
     def on_order_filled(self, order_id: str, symbol: str, quantity: float, price: float):
         """订单成交回调"""
-        if symbol in self.positions:
-            self.positions[symbol] += quantity
-        else:
-            self.positions[symbol] = quantity
+        idx = self._symbol_ids.get(symbol)
+        if idx is None:
+            idx = self._register_symbol(symbol)
+        self._position_qty[idx] += quantity
         
         logger.info(f"策略 {self.name} 订单成交: {symbol} {quantity} @ {price}")
     
+    def _register_symbol(self, symbol: str) -> int:
+        """登记新标的，返回其持仓下标"""
+        idx = len(self._position_qty)
+        self._symbol_ids[symbol] = idx
+        self._position_qty.append(0.0)
+        return idx
+    
+    @property
+    def positions(self) -> Dict[str, float]:
+        """当前持仓快照 {symbol: quantity}"""
+        qty = self._position_qty
+        return {symbol: qty[idx] for symbol, idx in self._symbol_ids.items()}
+    
     def start(self):
         """启动策略"""
         self.is_running = True
@@ -103,11 +119,17 @@ class BaseStrategy(ABC):
     
     def get_positions(self) -> Dict[str, float]:
         """获取当前持仓"""
-        return self.positions.copy()
+        return self.positions
     
     def get_signals(self, limit: int = 100) -> List[Signal]:
         """获取最近的交易信号"""
-        return self.signals[-limit:] if self.signals else []
+        if limit <= 0:
+            # 与列表切片 signals[-limit:] 语义一致：0 返回全部，负数跳过前 -limit 条
+            return list(islice(self.signals, -limit, None))
+        # 从右端反向取 limit 条再翻转，只遍历所需的尾部
+        recent = list(islice(reversed(self.signals), limit))
+        recent.reverse()
+        return recent
     
     def clear_signals(self):
         """清空信号队列（防止重复处理）"""
@@ -0,0 +1,270 @@
+"""
+技术指标的 Numba 加速内核
+输入输出均为 float64 ndarray，NaN 语义与 pandas rolling(window) 保持一致；
+numba 未安装时 HAS_NUMBA 为 False，调用方应回退到 pandas 实现。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, error_model="numpy")
+def compute_all_indicators(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    donchian_window: int,
+    rsi_period: int,
+    volume_window: int,
+    short_window: int,
+    long_window: int,
+):
+    """
+    单次遍历同时计算策略所需的全部指标，避免对各列做多次独立扫描
+
+    Returns:
+        (上轨, 下轨, RSI, 量比, 短均线, 长均线, 收益率标准差)
+        其中 RSI 与量比为 float32，其余为 float64
+    """
+    n = close.shape[0]
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    # 振荡类指标只与固定阈值比较，用 float32 存储减半内存；累加仍用 float64
+    rsi = np.full(n, np.nan, dtype=np.float32)
+    volume_ratio = np.full(n, np.nan, dtype=np.float32)
+    short_ma = np.full(n, np.nan)
+    long_ma = np.full(n, np.nan)
+
+    # 唐奇安通道：两个单调队列
+    max_queue = np.empty(n, dtype=np.int64)
+    min_queue = np.empty(n, dtype=np.int64)
+    max_head = 0
+    max_tail = 0
+    min_head = 0
+    min_tail = 0
+    high_nan = 0
+    low_nan = 0
+    # RSI：滑动涨跌幅和
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    loss_count = 0
+    # 均线与成交量：滑动和 + 窗口内 NaN 计数
+    volume_sum = 0.0
+    volume_nan = 0
+    short_sum = 0.0
+    short_nan = 0
+    long_sum = 0.0
+    long_nan = 0
+    # 收益率标准差：Welford 在线算法
+    ret_count = 0
+    ret_mean = 0.0
+    ret_m2 = 0.0
+
+    for i in range(n):
+        c = close[i]
+        h = high[i]
+        lo = low[i]
+        v = volume[i]
+
+        if np.isnan(h):
+            high_nan += 1
+        else:
+            while max_tail > max_head and high[max_queue[max_tail - 1]] <= h:
+                max_tail -= 1
+            max_queue[max_tail] = i
+            max_tail += 1
+        if np.isnan(lo):
+            low_nan += 1
+        else:
+            while min_tail > min_head and low[min_queue[min_tail - 1]] >= lo:
+                min_tail -= 1
+            min_queue[min_tail] = i
+            min_tail += 1
+        if i >= donchian_window:
+            if np.isnan(high[i - donchian_window]):
+                high_nan -= 1
+            if np.isnan(low[i - donchian_window]):
+                low_nan -= 1
+        while max_tail > max_head and max_queue[max_head] <= i - donchian_window:
+            max_head += 1
+        while min_tail > min_head and min_queue[min_head] <= i - donchian_window:
+            min_head += 1
+        if i >= donchian_window - 1:
+            if high_nan == 0:
+                upper[i] = high[max_queue[max_head]]
+            if low_nan == 0:
+                lower[i] = low[min_queue[min_head]]
+
+        if i > 0:
+            prev = close[i - 1]
+            delta = c - prev
+            if delta > 0:
+                gains[i] = delta
+            elif delta < 0:
+                losses[i] = -delta
+                loss_count += 1
+            ret = c / prev - 1.0
+            if not np.isnan(ret):
+                ret_count += 1
+                diff = ret - ret_mean
+                ret_mean += diff / ret_count
+                ret_m2 += diff * (ret - ret_mean)
+        gain_sum += gains[i]
+        loss_sum += losses[i]
+        if i >= rsi_period:
+            gain_sum -= gains[i - rsi_period]
+            loss_sum -= losses[i - rsi_period]
+            if losses[i - rsi_period] > 0:
+                loss_count -= 1
+        if i >= rsi_period - 1 and loss_count > 0:
+            rsi[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+        if np.isnan(v):
+            volume_nan += 1
+        else:
+            volume_sum += v
+        if i >= volume_window:
+            old = volume[i - volume_window]
+            if np.isnan(old):
+                volume_nan -= 1
+            else:
+                volume_sum -= old
+        if i >= volume_window - 1 and volume_nan == 0:
+            volume_ratio[i] = v / (volume_sum / volume_window)
+
+        if np.isnan(c):
+            short_nan += 1
+            long_nan += 1
+        else:
+            short_sum += c
+            long_sum += c
+        if i >= short_window:
+            old = close[i - short_window]
+            if np.isnan(old):
+                short_nan -= 1
+            else:
+                short_sum -= old
+        if i >= long_window:
+            old = close[i - long_window]
+            if np.isnan(old):
+                long_nan -= 1
+            else:
+                long_sum -= old
+        if i >= short_window - 1 and short_nan == 0:
+            short_ma[i] = short_sum / short_window
+        if i >= long_window - 1 and long_nan == 0:
+            long_ma[i] = long_sum / long_window
+
+    returns_std = np.sqrt(ret_m2 / (ret_count - 1)) if ret_count > 1 else np.nan
+    return upper, lower, rsi, volume_ratio, short_ma, long_ma, returns_std
+
+
+@njit(cache=True, boundscheck=False)
+def signal_strength_batch(
+    close: np.ndarray,
+    upper: np.ndarray,
+    lower: np.ndarray,
+    rsi: np.ndarray,
+    volume_ratio: np.ndarray,
+    candidates: np.ndarray,
+    is_long: np.ndarray,
+    trend_up: bool,
+    distance_to_resistance: float,
+    distance_to_support: float,
+    volatility: float,
+    threshold: float = -np.inf,
+) -> np.ndarray:
+    """
+    批量计算候选突破K线的信号强度（0-100）
+    这是评分规则的唯一实现，OptimizedHKIntradayStrategy.calculate_enhanced_signal_strength
+    以长度为 1 的批次调用本函数
+
+    各项按最大加分从大到小累加（趋势 20、突破 20、RSI 15、量比 15、波动率 10、支撑阻力 10），
+    当前得分加上剩余项满分仍低于 threshold 时提前结束，此时返回值只保证低于 threshold；
+    threshold 取默认的 -inf 时总是返回完整得分。
+    """
+    out = np.empty(candidates.shape[0], dtype=np.int64)
+    for k in range(candidates.shape[0]):
+        i = candidates[k]
+        long = is_long[k]
+        strength = 50
+        # 趋势（+20）：与突破方向一致加分，否则扣分
+        if trend_up == long:
+            strength += 20
+        else:
+            strength -= 15
+        if strength + 70 < threshold:
+            out[k] = max(0, strength)
+            continue
+        # 突破幅度（+20）
+        if long:
+            denom = 1e-8 if upper[i] < 1e-8 else upper[i]
+            breakout = (close[i] - upper[i]) / denom
+        else:
+            denom = 1e-8 if lower[i] < 1e-8 else lower[i]
+            breakout = (lower[i] - close[i]) / denom
+        if breakout > 0.01:
+            strength += 20
+        elif breakout > 0.005:
+            strength += 10
+        elif breakout < 0.001:
+            strength -= 10
+        if strength + 50 < threshold:
+            out[k] = max(0, strength)
+            continue
+        # RSI（+15）
+        r = rsi[i]
+        if long:
+            if r < 30:
+                strength += 15
+            elif r > 70:
+                strength -= 15
+        else:
+            if r > 70:
+                strength += 15
+            elif r < 30:
+                strength -= 15
+        if strength + 35 < threshold:
+            out[k] = max(0, strength)
+            continue
+        # 量比（+15）
+        v = volume_ratio[i]
+        if v > 1.8:
+            strength += 15
+        elif v > 1.3:
+            strength += 10
+        elif v < 0.7:
+            strength -= 10
+        if strength + 20 < threshold:
+            out[k] = max(0, strength)
+            continue
+        # 波动率（+10）
+        if 0.01 <= volatility <= 0.03:
+            strength += 10
+        elif volatility > 0.05:
+            strength -= 10
+        if strength + 10 < threshold:
+            out[k] = max(0, strength)
+            continue
+        # 支撑阻力距离（+10）
+        if long and distance_to_resistance > 0.03:
+            strength += 10
+        if not long and distance_to_support > 0.03:
+            strength += 10
+        out[k] = max(0, min(100, strength))
+    return out
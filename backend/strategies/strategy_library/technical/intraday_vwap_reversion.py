@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from ...base_strategy import BaseStrategy, Signal
@@ -15,20 +16,21 @@ class IntradayVWAPReversionStrategy(BaseStrategy):
     def generate_signals(self, data: pd.DataFrame):
         if data.empty or len(data) < 10:
             return []
-        df = data.copy()
-        df["tp"] = (df["high"].astype(float) + df["low"].astype(float) + df["close"].astype(float)) / 3.0
-        df["vwap_num"] = (df["tp"] * df["volume"].astype(float)).cumsum()
-        df["vwap_den"] = df["volume"].astype(float).cumsum()
-        df["vwap"] = df["vwap_num"] / df["vwap_den"].replace(0, pd.NA)
-        last = df.iloc[-1]
-        price = float(last["close"])
-        vwap = float(last["vwap"]) if pd.notna(last["vwap"]) else price
-        vol = float(last["volume"])
-        symbol = str(last["symbol"]) if "symbol" in df.columns else "UNKNOWN"
-
+        # 直接取 float64 视图：列已是 float64 时不产生拷贝
+        high = data["high"].to_numpy(dtype=np.float64, copy=False)
+        low = data["low"].to_numpy(dtype=np.float64, copy=False)
+        close = data["close"].to_numpy(dtype=np.float64, copy=False)
+        volume = data["volume"].to_numpy(dtype=np.float64, copy=False)
+        price = float(close[-1])
+        vol = float(volume[-1])
         if vol < self.min_volume:
             return []
 
+        # 只需要最后一根的 VWAP，用总和代替 cumsum
+        vol_sum = np.nansum(volume)
+        vwap = float(np.nansum((high + low + close) / 3.0 * volume) / vol_sum) if vol_sum else price
+        symbol = str(data["symbol"].to_numpy()[-1]) if "symbol" in data.columns else "UNKNOWN"
+
         signals = []
         if price < vwap * (1 - self.deviation):
             signals.append(Signal(symbol=symbol, action="buy", quantity=1.0, price=price, confidence=0.6, reason="below_vwap_revert"))
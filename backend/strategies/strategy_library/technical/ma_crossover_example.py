@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from ...base_strategy import BaseStrategy, Signal
@@ -14,14 +15,16 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
     def generate_signals(self, data: pd.DataFrame):
         if data.empty or len(data) < max(self.fast, self.slow) + 1:
             return []
-        close = data["close"].astype(float)
-        ma_fast = close.rolling(self.fast).mean()
-        ma_slow = close.rolling(self.slow).mean()
-        cross_up = ma_fast.iloc[-2] <= ma_slow.iloc[-2] and ma_fast.iloc[-1] > ma_slow.iloc[-1]
-        cross_down = ma_fast.iloc[-2] >= ma_slow.iloc[-2] and ma_fast.iloc[-1] < ma_slow.iloc[-1]
-
-        symbol = str(data["symbol"].iloc[-1])
-        last_price = float(close.iloc[-1])
+        # 只需要最后两根的均线，直接对尾部切片求均值，与历史长度无关
+        close = data["close"].to_numpy(dtype=np.float64, copy=False)
+        f, s = self.fast, self.slow
+        fast_last, fast_prev = close[-f:].mean(), close[-f - 1:-1].mean()
+        slow_last, slow_prev = close[-s:].mean(), close[-s - 1:-1].mean()
+        cross_up = fast_prev <= slow_prev and fast_last > slow_last
+        cross_down = fast_prev >= slow_prev and fast_last < slow_last
+
+        symbol = str(data["symbol"].to_numpy()[-1])
+        last_price = float(close[-1])
 
         signals = []
         if cross_up:
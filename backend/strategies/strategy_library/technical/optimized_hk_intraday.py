@@ -1,10 +1,42 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
+from enum import IntEnum
+
 import numpy as np
 import pandas as pd
 
+try:
+    import bottleneck as bn
+    HAS_BOTTLENECK = True
+except ImportError:
+    HAS_BOTTLENECK = False
+
 from ...base_strategy import BaseStrategy, Signal
+from ._indicators_numba import (
+    HAS_NUMBA,
+    compute_all_indicators,
+    signal_strength_batch,
+)
+
+
+class Trend(IntEnum):
+    """价格趋势"""
+    STRONG_UPTREND = 1
+    WEAK_UPTREND = 2
+    STRONG_DOWNTREND = 3
+    WEAK_DOWNTREND = 4
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+UPTRENDS = frozenset({Trend.STRONG_UPTREND, Trend.WEAK_UPTREND})
+
+# 单根K线打分时传给批量内核的候选下标
+_SINGLE_CANDIDATE = np.zeros(1, dtype=np.int64)
 
 
 class OptimizedHKIntradayStrategy(BaseStrategy):
@@ -14,9 +46,12 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
         cfg = config or {}
         self.current_capital = float(cfg.get("initial_capital", 10000))
         # 动态本金配置
-        self.capital_config = self.initialize_capital_config(self.current_capital)
+        self._apply_capital_config(self.initialize_capital_config(self.current_capital))
         # 其他可调参数
         self.donchian_window = int(cfg.get("donchian_window", 20))
+        # multi_timeframe_analysis 结果缓存（数据未变化时直接复用）
+        self._mta_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._mta_cache_size = 4
 
         # 交易状态
         self.daily_trade_count = 0
@@ -65,14 +100,29 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
                 "signal_strength_threshold": 55,
             }
 
+    def _apply_capital_config(self, cfg: dict) -> None:
+        """
+        设置本金配置，同时把逐笔计算要读的配置项缓存为类型化的实例属性，
+        热路径只做一次属性读取而不查字典。修改配置须经此方法，缓存才会同步。
+        """
+        self.capital_config = cfg
+        self._max_trades = int(cfg["max_daily_trades"])
+        self._max_pos_ratio = float(cfg["max_position_ratio"])
+        self._daily_sl = float(cfg["daily_stop_loss"])
+        self._trade_sl = float(cfg["trade_stop_loss"])
+        self._min_profit = float(cfg["min_profit_after_cost"])
+        self._rr = float(cfg["risk_reward_ratio"])
+        self._thresh = float(cfg["signal_strength_threshold"])
+
     def update_capital(self, new_capital: float) -> None:
         self.current_capital = float(new_capital)
-        self.capital_config = self.initialize_capital_config(self.current_capital)
+        self._apply_capital_config(self.initialize_capital_config(self.current_capital))
+        self._mta_cache.clear()
         self.logger.info(f"本金更新为: {new_capital}HKD, 新配置: {self.capital_config}")
 
     # ========= 频率/费用/仓位 =========
     def calculate_dynamic_frequency(self, market_volatility: float | None = None) -> int:
-        base_frequency = int(self.capital_config["max_daily_trades"])
+        base_frequency = self._max_trades
         freq_adj = 1.0
         if market_volatility is not None:
             if market_volatility > 0.03:
@@ -83,66 +133,144 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
             freq_adj *= 0.5
         return max(1, int(base_frequency * freq_adj))
 
+    # 费用、仓位与止损止盈的规则只在 *_batch 向量化方法中实现一份，
+    # 单根K线的方法以长度为 1 的数组调用它们，实时与回测结果保持一致
     def calculate_transaction_cost(self, price: float, quantity: int, is_buy: bool = True) -> float:
-        amount = float(price) * float(quantity)
-        commission = max(amount * self.broker_config["commission_rate"], self.broker_config["min_commission"])
-        stamp_duty = amount * self.broker_config["stamp_duty"] if not is_buy else 0.0
-        trading_levy = amount * self.broker_config["trading_levy"]
-        sfc_levy = amount * self.broker_config["sfc_levy"]
-        platform_fee = self.broker_config["platform_fee"]
-        total = commission + stamp_duty + trading_levy + sfc_levy + platform_fee
-        return round(total, 2)
+        cost = self._transaction_cost_batch(
+            np.array([price], dtype=np.float64), np.array([quantity], dtype=np.float64), is_buy
+        )
+        return float(cost[0])
 
     def calculate_optimal_position(self, current_price: float, stop_loss_price: float, signal_strength: float) -> tuple[int, str]:
-        risk_per_trade = self.current_capital * self.capital_config["trade_stop_loss"]
-        price_risk = abs(current_price - stop_loss_price)
-        if price_risk <= 0:
+        qty, profit, cost = self._position_sizes_batch(
+            np.array([current_price], dtype=np.float64),
+            np.array([stop_loss_price], dtype=np.float64),
+            np.array([signal_strength], dtype=np.float64),
+        )
+        if not abs(current_price - stop_loss_price) > 0:
             return 0, "价格风险为0"
-        risk_based_qty = int(risk_per_trade / price_risk)
-        capital_based_qty = int((self.current_capital * self.capital_config["max_position_ratio"]) / current_price)
-        strength_multiplier = float(signal_strength) / 100.0
-        strength_adjusted_qty = int(risk_based_qty * strength_multiplier)
-        qty = min(risk_based_qty, capital_based_qty, strength_adjusted_qty)
+        if profit[0] <= cost[0] * 1.5:
+            return 0, f"预期盈利{profit[0]:.2f}不足覆盖成本{cost[0]:.2f}"
+        return int(qty[0]), "计算成功"
+
+    def _transaction_cost_batch(self, prices: np.ndarray, quantities: np.ndarray, is_buy: bool = True) -> np.ndarray:
+        """批量计算交易费用（佣金不低于最低佣金，卖出另收印花税），结果保留两位小数"""
+        cfg = self.broker_config
+        amount = prices * quantities
+        commission = np.maximum(amount * cfg["commission_rate"], cfg["min_commission"])
+        stamp_duty = amount * cfg["stamp_duty"] if not is_buy else 0.0
+        total = commission + stamp_duty + amount * cfg["trading_levy"] + amount * cfg["sfc_levy"] + cfg["platform_fee"]
+        return np.round(total, 2)
+
+    def _position_sizes_batch(
+        self, prices: np.ndarray, stop_losses: np.ndarray, strengths: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量计算建议股数
+
+        Returns:
+            (股数, 预期盈利, 双边成本)；价格风险为 0 或盈利不足覆盖成本时股数为 0，
+            预期盈利与成本为成本效益检查所用的值
+        """
+        capital = self.current_capital
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_risk = np.abs(prices - stop_losses)
+            risk_qty = np.trunc(capital * self._trade_sl / price_risk)
+            capital_qty = np.trunc((capital * self._max_pos_ratio) / prices)
+            strength_qty = np.trunc(risk_qty * (strengths / 100.0))
+            qty = np.minimum(np.minimum(risk_qty, capital_qty), strength_qty)
+        qty[~(price_risk > 0)] = 0
         # 成本效益检查（双边）
-        estimated_profit = abs(current_price * self.capital_config["min_profit_after_cost"] * qty)
-        estimated_cost = self.calculate_transaction_cost(current_price, qty, True) * 2
-        if estimated_profit <= estimated_cost * 1.5:
-            return 0, f"预期盈利{estimated_profit:.2f}不足覆盖成本{estimated_cost:.2f}"
+        cost = self._transaction_cost_batch(prices, qty) * 2
+        profit = np.abs(prices * self._min_profit * qty)
+        qty[profit <= cost * 1.5] = 0
         # 资金充足性
-        total_cost = current_price * qty + estimated_cost
-        if total_cost > self.current_capital * 0.9:
-            affordable_qty = int((self.current_capital * 0.9 - estimated_cost) / current_price)
-            qty = max(0, min(qty, affordable_qty))
-        return max(0, qty), "计算成功"
+        over = prices * qty + cost > capital * 0.9
+        affordable = np.trunc((capital * 0.9 - cost) / prices)
+        qty = np.where(over, np.minimum(qty, affordable), qty)
+        return np.maximum(qty, 0).astype(np.int64), profit, cost
 
     # ========= 多时间框架与指标 =========
-    def multi_timeframe_analysis(self, df: pd.DataFrame) -> dict:
+    @staticmethod
+    def _analysis_key(df: pd.DataFrame) -> tuple:
+        """数据指纹：长度、首尾索引以及首尾K线的关键价量"""
+        close = df["close"]
+        return (
+            len(df),
+            df.index[0],
+            df.index[-1],
+            float(close.iat[0]),
+            float(close.iat[-1]),
+            float(df["high"].iat[-1]),
+            float(df["low"].iat[-1]),
+            float(df["volume"].iat[-1]),
+        )
+
+    @staticmethod
+    def _float_series(s: pd.Series) -> pd.Series:
+        """OHLCV 列通常已是 float64，此时直接复用原列，只有其他 dtype 才转换"""
+        return s if s.dtype == np.float64 else s.astype(np.float64)
+
+    def multi_timeframe_analysis(self, df: pd.DataFrame, window: int | None = None) -> dict:
+        window = int(window or self.donchian_window)
+        key = (window,) + self._analysis_key(df)
+        cached = self._mta_cache.get(key)
+        if cached is not None:
+            self._mta_cache.move_to_end(key)
+            return cached
         analysis: dict = {}
-        close = df["close"].astype(float)
-        vol = df["volume"].astype(float)
-        analysis["rsi_14"] = self.calculate_rsi(close, 14)
-        analysis["volume_ma_ratio"] = vol / vol.rolling(10).mean()
-        analysis["price_trend"] = self.assess_trend(close)
-        analysis["volatility"] = close.pct_change().std() * np.sqrt(252)
+        if HAS_NUMBA:
+            # 单次遍历算出通道、RSI、量比、均线与波动率
+            # float64 列直接取底层缓冲区，不复制
+            close = df["close"].to_numpy(dtype=np.float64, copy=False)
+            upper, lower, rsi, volume_ratio, short_ma, long_ma, returns_std = compute_all_indicators(
+                close,
+                df["high"].to_numpy(dtype=np.float64, copy=False),
+                df["low"].to_numpy(dtype=np.float64, copy=False),
+                df["volume"].to_numpy(dtype=np.float64, copy=False),
+                window, 14, 10, 5, 20,
+            )
+            analysis["rsi_14"] = rsi
+            analysis["volume_ma_ratio"] = volume_ratio
+            analysis["price_trend"] = self._classify_trend(close[-1], short_ma[-1], long_ma[-1])
+            analysis["volatility"] = returns_std * np.sqrt(252)
+        else:
+            close = self._float_series(df["close"])
+            vol = self._float_series(df["volume"])
+            upper, lower = self.calculate_donchian_bands(df["high"], df["low"], window)
+            analysis["rsi_14"] = self.calculate_rsi(close, 14).to_numpy(dtype=np.float32)
+            analysis["volume_ma_ratio"] = (vol / vol.rolling(10).mean()).to_numpy(dtype=np.float32)
+            analysis["price_trend"] = self.assess_trend(close)
+            analysis["volatility"] = close.pct_change().std() * np.sqrt(252)
+        analysis["upper_band"] = upper
+        analysis["lower_band"] = lower
         analysis["support_resistance"] = self.find_support_resistance(df)
+        self._mta_cache[key] = analysis
+        if len(self._mta_cache) > self._mta_cache_size:
+            self._mta_cache.popitem(last=False)
         return analysis
 
-    def assess_trend(self, prices: pd.Series, short_window: int = 5, long_window: int = 20) -> str:
+    def assess_trend(self, prices: pd.Series, short_window: int = 5, long_window: int = 20) -> Trend:
         short_ma = prices.rolling(short_window).mean()
         long_ma = prices.rolling(long_window).mean()
-        if short_ma.iloc[-1] > long_ma.iloc[-1] and prices.iloc[-1] > short_ma.iloc[-1]:
-            return "strong_uptrend"
-        elif short_ma.iloc[-1] > long_ma.iloc[-1]:
-            return "weak_uptrend"
-        elif short_ma.iloc[-1] < long_ma.iloc[-1] and prices.iloc[-1] < short_ma.iloc[-1]:
-            return "strong_downtrend"
+        return self._classify_trend(prices.iloc[-1], short_ma.iloc[-1], long_ma.iloc[-1])
+
+    @staticmethod
+    def _classify_trend(price: float, short_ma: float, long_ma: float) -> Trend:
+        if short_ma > long_ma and price > short_ma:
+            return Trend.STRONG_UPTREND
+        elif short_ma > long_ma:
+            return Trend.WEAK_UPTREND
+        elif short_ma < long_ma and price < short_ma:
+            return Trend.STRONG_DOWNTREND
         else:
-            return "weak_downtrend"
+            return Trend.WEAK_DOWNTREND
 
     def find_support_resistance(self, df: pd.DataFrame, window: int = 10) -> dict:
-        high = df["high"].astype(float).tail(window).max()
-        low = df["low"].astype(float).tail(window).min()
-        current_price = float(df["close"].astype(float).iloc[-1])
+        # 直接在尾部切片上取极值（fmax/fmin 与 pandas 一样跳过 NaN），不构造中间 Series
+        high = float(np.fmax.reduce(df["high"].to_numpy(dtype=np.float64, copy=False)[-window:]))
+        low = float(np.fmin.reduce(df["low"].to_numpy(dtype=np.float64, copy=False)[-window:]))
+        current_price = float(df["close"].iat[-1])
         return {
             "resistance": high,
             "support": low,
@@ -152,104 +280,177 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
 
     # ========= 信号生成 =========
     def enhanced_donchian_strategy(self, df: pd.DataFrame, window: int) -> list[dict]:
-        df = df.copy()
-        df["upper_band"] = df["high"].astype(float).rolling(window=window).max()
-        df["lower_band"] = df["low"].astype(float).rolling(window=window).min()
-        market_analysis = self.multi_timeframe_analysis(df)
+        """对整段历史逐根评估突破（回测/批量分析用），返回全部信号"""
+        # 通道保留为局部数组，不复制、不修改输入的 DataFrame
+        market_analysis = self.multi_timeframe_analysis(df, window)
+        upper = market_analysis["upper_band"]
+        lower = market_analysis["lower_band"]
+        # 一次性取出列数组，用向量化比较找出突破K线，只在候选K线上循环
+        close = df["close"].to_numpy(dtype=np.float64, copy=False)
+        long_mask = np.zeros(len(df), dtype=bool)
+        short_mask = np.zeros(len(df), dtype=bool)
+        long_mask[window:] = close[window:] > upper[window - 1:-1]
+        short_mask[window:] = close[window:] < lower[window - 1:-1]
+        candidates = np.flatnonzero(long_mask | short_mask)
+        if not len(candidates):
+            return []
+        is_long = long_mask[candidates]
+        rsi = market_analysis["rsi_14"]
+        volume_ratio = market_analysis["volume_ma_ratio"]
+        # 一次性为全部候选K线打分（未安装 numba 时内核以纯 Python 运行）
+        strengths = signal_strength_batch(
+            close, upper, lower, rsi, volume_ratio, candidates, is_long,
+            *self._strength_context(market_analysis), self._thresh,
+        )
+        passed = strengths >= self._thresh
+        candidates, is_long, strengths = candidates[passed], is_long[passed], strengths[passed]
+        # 对通过阈值的K线批量计算止损止盈与仓位
+        prices = close[candidates]
+        stop_losses, take_profits = self._risk_levels_batch(prices, is_long, market_analysis)
+        sizes, _, _ = self._position_sizes_batch(prices, stop_losses, strengths)
+        shared = self._shared_signal_fields(market_analysis, window)
         signals: list[dict] = []
-        for i in range(window, len(df)):
-            current = df.iloc[i]
-            prev = df.iloc[i - 1]
-            long_break = current["close"] > prev["upper_band"]
-            short_break = current["close"] < prev["lower_band"]
-            if not (long_break or short_break):
-                continue
-            direction = "long" if long_break else "short"
-            signal_strength = self.calculate_enhanced_signal_strength(current, direction, market_analysis, i)
-            if signal_strength < self.capital_config["signal_strength_threshold"]:
-                continue
-            stop_loss, take_profit = self.calculate_enhanced_risk_levels(current["close"], direction, market_analysis)
-            position_size, position_reason = self.calculate_optimal_position(current["close"], stop_loss, signal_strength)
-            if position_size <= 0:
-                continue
-            expected_profit = abs(take_profit - current["close"]) * position_size
-            expected_cost = self.calculate_transaction_cost(current["close"], position_size, True)
-            cost_ratio = (expected_profit / expected_cost) if expected_cost > 0 else 0
+        for k in np.flatnonzero(sizes > 0):
             signals.append(
-                {
-                    "timestamp": current.name,
-                    "symbol": "HK",
-                    "action": "BUY" if direction == "long" else "SELL",
-                    "reason": self.generate_signal_reason(current, direction, prev, market_analysis),
-                    "current_price": float(current["close"]),
-                    "signal_strength": float(signal_strength),
-                    "position_size": int(position_size),
-                    "position_reason": position_reason,
-                    "stop_loss": float(stop_loss),
-                    "take_profit": float(take_profit),
-                    "risk_reward_ratio": abs(take_profit - current["close"]) / max(abs(current["close"] - stop_loss), 1e-8),
-                    "cost_ratio": float(cost_ratio),
-                    "market_volatility": float(market_analysis["volatility"]),
-                    "trend_strength": str(market_analysis["price_trend"]),
-                    "rsi": float(market_analysis["rsi_14"].iloc[i]),
-                    "volume_ratio": float(market_analysis["volume_ma_ratio"].iloc[i]),
-                    "support_resistance": market_analysis["support_resistance"],
-                    "bars_analyzed": int(window),
-                    "dynamic_frequency": int(self.calculate_dynamic_frequency(market_analysis["volatility"])),
-                }
+                self._build_signal(
+                    df.index, close, candidates[k], "long" if is_long[k] else "short", int(strengths[k]),
+                    stop_losses[k], take_profits[k], int(sizes[k]), "计算成功", market_analysis, shared,
+                )
             )
         return signals
 
-    def calculate_enhanced_signal_strength(self, current: pd.Series, direction: str, market_analysis: dict, index: int) -> int:
-        strength = 50
-        rsi = market_analysis["rsi_14"].iloc[index]
-        if direction == "long":
-            if rsi < 30:
-                strength += 15
-            elif rsi > 70:
-                strength -= 15
+    def _evaluate_last_bar(self, df: pd.DataFrame, window: int) -> dict | None:
+        """只评估最新一根K线是否突破（实时运行用），历史指标由缓存复用"""
+        i = len(df) - 1
+        if i < window:
+            return None
+        market_analysis = self.multi_timeframe_analysis(df, window)
+        upper = market_analysis["upper_band"]
+        lower = market_analysis["lower_band"]
+        close = df["close"].to_numpy(dtype=np.float64, copy=False)
+        price = close[i]
+        if price > upper[i - 1]:
+            direction = "long"
+        elif price < lower[i - 1]:
+            direction = "short"
         else:
-            if rsi > 70:
-                strength += 15
-            elif rsi < 30:
-                strength -= 15
-        volume_ratio = market_analysis["volume_ma_ratio"].iloc[index]
-        if volume_ratio > 1.8:
-            strength += 15
-        elif volume_ratio > 1.3:
-            strength += 10
-        elif volume_ratio < 0.7:
-            strength -= 10
-        trend = market_analysis["price_trend"]
-        if (direction == "long" and "uptrend" in trend) or (direction == "short" and "downtrend" in trend):
-            strength += 20
-        elif (direction == "long" and "downtrend" in trend) or (direction == "short" and "uptrend" in trend):
-            strength -= 15
+            return None
+        signal_strength = self.calculate_enhanced_signal_strength(
+            price, upper[i], lower[i], direction,
+            market_analysis["rsi_14"][i], market_analysis["volume_ma_ratio"][i], market_analysis,
+        )
+        if signal_strength < self._thresh:
+            return None
+        stop_loss, take_profit = self.calculate_enhanced_risk_levels(price, direction, market_analysis)
+        position_size, position_reason = self.calculate_optimal_position(price, stop_loss, signal_strength)
+        if position_size <= 0:
+            return None
+        return self._build_signal(
+            df.index, close, i, direction, signal_strength,
+            stop_loss, take_profit, position_size, position_reason,
+            market_analysis, self._shared_signal_fields(market_analysis, window),
+        )
+
+    def _build_signal(
+        self,
+        index: pd.Index,
+        close: np.ndarray,
+        i: int,
+        direction: str,
+        signal_strength: int,
+        stop_loss: float,
+        take_profit: float,
+        position_size: int,
+        position_reason: str,
+        market_analysis: dict,
+        shared: dict,
+    ) -> dict:
+        """组装第 i 根K线的信号明细，shared 为同一批信号共用的字段"""
+        price = close[i]
+        expected_profit = abs(take_profit - price) * position_size
+        expected_cost = self.calculate_transaction_cost(price, position_size, True)
+        cost_ratio = (expected_profit / expected_cost) if expected_cost > 0 else 0
+        return {
+            "timestamp": index[i],
+            "symbol": "HK",
+            "action": "BUY" if direction == "long" else "SELL",
+            "reason": self.generate_signal_reason(
+                price, direction, market_analysis["upper_band"][i - 1], market_analysis["lower_band"][i - 1], market_analysis
+            ),
+            "current_price": float(price),
+            "signal_strength": float(signal_strength),
+            "position_size": int(position_size),
+            "position_reason": position_reason,
+            "stop_loss": float(stop_loss),
+            "take_profit": float(take_profit),
+            "risk_reward_ratio": abs(take_profit - price) / max(abs(price - stop_loss), 1e-8),
+            "cost_ratio": float(cost_ratio),
+            "rsi": float(market_analysis["rsi_14"][i]),
+            "volume_ratio": float(market_analysis["volume_ma_ratio"][i]),
+            **shared,
+        }
+
+    def _shared_signal_fields(self, market_analysis: dict, window: int) -> dict:
+        """波动率、趋势、支撑阻力与动态频率对同一次分析的所有信号都相同，只算一次"""
+        return {
+            "market_volatility": float(market_analysis["volatility"]),
+            "trend_strength": market_analysis["price_trend"].label,
+            "support_resistance": market_analysis["support_resistance"],
+            "bars_analyzed": int(window),
+            "dynamic_frequency": int(self.calculate_dynamic_frequency(market_analysis["volatility"])),
+        }
+
+    def calculate_enhanced_signal_strength(
+        self,
+        close: float,
+        upper_band: float,
+        lower_band: float,
+        direction: str,
+        rsi: float,
+        volume_ratio: float,
+        market_analysis: dict,
+    ) -> int:
+        """
+        计算单根K线的信号强度（0-100）
+
+        评分规则只在 signal_strength_batch 中实现一份，这里作为长度为 1 的批次调用，
+        保证实时评估与回测批量打分结果一致。
+        得分已无法达到 signal_strength_threshold 时提前返回，此时返回值只保证低于阈值。
+        """
+        strengths = signal_strength_batch(
+            np.array([close], dtype=np.float64),
+            np.array([upper_band], dtype=np.float64),
+            np.array([lower_band], dtype=np.float64),
+            np.array([rsi], dtype=np.float64),
+            np.array([volume_ratio], dtype=np.float64),
+            _SINGLE_CANDIDATE,
+            np.array([direction == "long"]),
+            *self._strength_context(market_analysis),
+            self._thresh,
+        )
+        return int(strengths[0])
+
+    @staticmethod
+    def _strength_context(market_analysis: dict) -> tuple:
+        """打分用到的整段行情特征：(趋势向上, 距阻力位, 距支撑位, 波动率)"""
         sr = market_analysis["support_resistance"]
-        if direction == "long" and sr["distance_to_resistance"] > 0.03:
-            strength += 10
-        if direction == "short" and sr["distance_to_support"] > 0.03:
-            strength += 10
-        volatility = market_analysis["volatility"]
-        if 0.01 <= volatility <= 0.03:
-            strength += 10
-        elif volatility > 0.05:
-            strength -= 10
-        if direction == "long":
-            breakout_strength = (current["close"] - current["upper_band"]) / max(current["upper_band"], 1e-8)
-        else:
-            breakout_strength = (current["lower_band"] - current["close"]) / max(current["lower_band"], 1e-8)
-        if breakout_strength > 0.01:
-            strength += 20
-        elif breakout_strength > 0.005:
-            strength += 10
-        elif breakout_strength < 0.001:
-            strength -= 10
-        return int(max(0, min(100, strength)))
+        return (
+            market_analysis["price_trend"] in UPTRENDS,
+            float(sr["distance_to_resistance"]),
+            float(sr["distance_to_support"]),
+            float(market_analysis["volatility"]),
+        )
 
     def calculate_enhanced_risk_levels(self, current_price: float, direction: str, market_analysis: dict) -> tuple[float, float]:
-        base_sl = self.capital_config["trade_stop_loss"]
-        base_rr = self.capital_config["risk_reward_ratio"]
+        stop_loss, take_profit = self._risk_levels_batch(
+            np.array([current_price], dtype=np.float64), np.array([direction == "long"]), market_analysis
+        )
+        return float(stop_loss[0]), float(take_profit[0])
+
+    def _risk_levels_batch(self, prices: np.ndarray, is_long: np.ndarray, market_analysis: dict) -> tuple[np.ndarray, np.ndarray]:
+        """批量计算止损止盈价：按波动率调整止损幅度，止损不越过支撑/阻力位"""
+        base_sl = self._trade_sl
+        base_rr = self._rr
         vol = market_analysis["volatility"]
         if vol > 0.03:
             sl_adj = 1.2
@@ -258,42 +459,49 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
         else:
             sl_adj = 1.0
         adjusted_sl = base_sl * sl_adj
-        if direction == "long":
-            stop_loss = current_price * (1 - adjusted_sl)
-            take_profit = current_price * (1 + adjusted_sl * base_rr)
-        else:
-            stop_loss = current_price * (1 + adjusted_sl)
-            take_profit = current_price * (1 - adjusted_sl * base_rr)
+        stop_loss = np.where(is_long, prices * (1 - adjusted_sl), prices * (1 + adjusted_sl))
+        take_profit = np.where(is_long, prices * (1 + adjusted_sl * base_rr), prices * (1 - adjusted_sl * base_rr))
         sr = market_analysis["support_resistance"]
-        if direction == "long" and stop_loss < sr["support"]:
-            stop_loss = sr["support"] * 0.995
-        if direction == "short" and stop_loss > sr["resistance"]:
-            stop_loss = sr["resistance"] * 1.005
-        return float(stop_loss), float(take_profit)
+        stop_loss = np.where(is_long & (stop_loss < sr["support"]), sr["support"] * 0.995, stop_loss)
+        stop_loss = np.where(~is_long & (stop_loss > sr["resistance"]), sr["resistance"] * 1.005, stop_loss)
+        return stop_loss, take_profit
 
     # ========= 指标与信号桥接 =========
+    def calculate_donchian_bands(self, high: pd.Series, low: pd.Series, window: int) -> tuple[np.ndarray, np.ndarray]:
+        """唐奇安通道的非 numba 实现（装有 numba 时由 compute_all_indicators 一并计算）"""
+        if HAS_BOTTLENECK and len(high) >= window:
+            # bottleneck 的滑动极值为 C 实现的单调队列，窗口内有 NaN 时同样返回 NaN；
+            # 数据短于窗口时 move_max 会报错，交给 pandas 返回全 NaN
+            upper = bn.move_max(high.to_numpy(dtype=np.float64, copy=False), window)
+            lower = bn.move_min(low.to_numpy(dtype=np.float64, copy=False), window)
+        else:
+            upper = self._float_series(high).rolling(window=window).max().to_numpy()
+            lower = self._float_series(low).rolling(window=window).min().to_numpy()
+        return upper, lower
+
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
+        """RSI（简单移动平均版本）的 pandas 实现，也是 compute_all_indicators 的参照"""
         delta = prices.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
         rs = gain / loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return 100 - (100 / (1 + rs))
 
-    def generate_signal_reason(self, current: pd.Series, direction: str, prev: pd.Series, ma: dict) -> str:
+    def generate_signal_reason(
+        self, close: float, direction: str, prev_upper: float, prev_lower: float, ma: dict
+    ) -> str:
         reasons = []
         if direction == "long":
-            reasons.append(f"价格{current['close']:.2f}突破上轨{prev['upper_band']:.2f}")
+            reasons.append(f"价格{close:.2f}突破上轨{prev_upper:.2f}")
         else:
-            reasons.append(f"价格{current['close']:.2f}跌破下轨{prev['lower_band']:.2f}")
-        rsi_val = ma["rsi_14"].iloc[-1]
+            reasons.append(f"价格{close:.2f}跌破下轨{prev_lower:.2f}")
+        rsi_val = ma["rsi_14"][-1]
         if (direction == "long" and rsi_val < 40) or (direction == "short" and rsi_val > 60):
             reasons.append(f"RSI({rsi_val:.1f})提供确认")
-        vol_ratio = ma["volume_ma_ratio"].iloc[-1]
+        vol_ratio = ma["volume_ma_ratio"][-1]
         if vol_ratio > 1.5:
             reasons.append(f"成交量放大{vol_ratio:.1f}倍")
-        trend = ma["price_trend"]
-        if (direction == "long" and "uptrend" in trend) or (direction == "short" and "downtrend" in trend):
+        if (ma["price_trend"] in UPTRENDS) == (direction == "long"):
             reasons.append("趋势方向一致")
         return "; ".join(reasons)
 
@@ -302,13 +510,12 @@ class OptimizedHKIntradayStrategy(BaseStrategy):
         if data.empty or len(data) < max(30, self.donchian_window + 1):
             return []
         # 频率限制检查（可基于 self.daily_trade_count 与 dynamic_frequency 做限制，这里只生成信号，执行层控制频次）
-        signals = self.enhanced_donchian_strategy(data, self.donchian_window)
-        if not signals:
+        # 实时运行只关心最新一根K线是否突破，历史K线的信号不再重复发出
+        s = self._evaluate_last_bar(data, self.donchian_window)
+        if s is None:
             return []
-        # 取最新一个信号转为标准 Signal
-        s = signals[-1]
         action = "buy" if s["action"].upper() == "BUY" else "sell"
-        symbol = str(data["symbol"].iloc[-1]) if "symbol" in data.columns else "HK"
+        symbol = str(data["symbol"].to_numpy()[-1]) if "symbol" in data.columns else "HK"
         sig = Signal(
             symbol=symbol,
             action=action,
@@ -1,16 +1,12 @@
 """
 多数据源测试脚本
 测试各个市场数据提供方的功能
+
+在项目根目录运行（或 pip install -e . 后在任意目录运行）：
+    python -m backend.tests.test_data_sources
 """
 
 import sys
-import os
-from pathlib import Path
-
-# 添加项目根目录到路径
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 import asyncio
 import logging
 from datetime import datetime, timedelta
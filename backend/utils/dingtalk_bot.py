@@ -8,32 +8,51 @@ import urllib.parse
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class DingTalkBot:
+    # 钉钉要求签名时间戳与服务器时间相差不超过1小时，签名在此窗口一半内复用
+    SIGN_REUSE_MS = 30 * 60 * 1000
+
     def __init__(self, webhook: str, secret: str | None = None):
         self.webhook = webhook
         self.secret = secret
+        self._secret_bytes = secret.encode("utf-8") if secret else None
+        self._hmac_proto = hmac.new(self._secret_bytes, digestmod=hashlib.sha256) if secret else None
+        self._sign_cache: dict = {}
+        self._sign_ts_ms = 0
+        # 复用连接：避免每条消息重新建立 TCP/TLS 连接
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def _sign(self) -> dict:
         if not self.secret:
             return {}
-        timestamp = str(round(time.time() * 1000))
-        string_to_sign = f"{timestamp}\n{self.secret}".encode("utf-8")
-        hmac_code = hmac.new(self.secret.encode("utf-8"), string_to_sign, digestmod=hashlib.sha256).digest()
-        sign = urllib.parse.quote_plus(base64.b64encode(hmac_code))
-        return {"timestamp": timestamp, "sign": sign}
+        now_ms = round(time.time() * 1000)
+        if self._sign_cache and now_ms - self._sign_ts_ms < self.SIGN_REUSE_MS:
+            return self._sign_cache
+        timestamp = str(now_ms)
+        mac = self._hmac_proto.copy()
+        mac.update(b"%d\n" % now_ms + self._secret_bytes)
+        sign = urllib.parse.quote_plus(base64.b64encode(mac.digest()))
+        self._sign_cache = {"timestamp": timestamp, "sign": sign}
+        self._sign_ts_ms = now_ms
+        return self._sign_cache
 
     def send_text(self, content: str) -> None:
         url = self.webhook
         params = self._sign()
         payload = {"msgtype": "text", "text": {"content": content}}
-        requests.post(url, params=params, json=payload, timeout=10)
+        self._session.post(url, params=params, json=payload, timeout=10)
 
     def send_markdown(self, title: str, text_md: str) -> None:
         url = self.webhook
         params = self._sign()
         payload = {"msgtype": "markdown", "markdown": {"title": title, "text": text_md}}
-        requests.post(url, params=params, json=payload, timeout=10)
+        self._session.post(url, params=params, json=payload, timeout=10)
 
 
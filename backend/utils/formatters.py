@@ -1,109 +1,126 @@
 from __future__ import annotations
 
+import functools
 import json
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+# 字段提取模式：每个字段的各种格式合并为一个交替模式，分支按优先级排列、各自带一个捕获组，
+# 模块加载时编译一次
+_POSITION_RE = re.compile(r'\*\*仓位权重\*\*[：:]\s*(\d+(?:\.\d+)?)%?|仓位权重[：:]\s*(\d+(?:\.\d+)?)%?')  # **仓位权重**: 65% | 仓位权重：65%
+_STOP_LOSS_RE = re.compile(r'\*\*止损价格\*\*[：:]\s*(\d+(?:\.\d+)?)|止损价格[：:]\s*(\d+(?:\.\d+)?)')  # **止损价格**: 645.0 | 止损价格: 645.0
+_TAKE_PROFIT_RE = re.compile(r'\*\*止盈目标\*\*[：:]\s*(\d+(?:\.\d+)?)|止盈目标[：:]\s*(\d+(?:\.\d+)?)')  # **止盈目标**: 635.0 | 止盈目标: 635.0
+_CONFIDENCE_RE = re.compile(r'\*\*信心度\*\*[：:]\s*(\d+(?:\.\d+)?)%?|信心度[：:]\s*(\d+(?:\.\d+)?)%?')  # **信心度**: 78% | 信心度: 78%
+_DIRECTION_RE = re.compile(
+    r'\*\*操作方向\*\*[：:]\s*(buy|sell|hold|买入|卖出|持有)|操作方向[：:]\s*(buy|sell|hold|买入|卖出|持有)|方向[：:]\s*(buy|sell|hold|买入|卖出|持有)',
+    re.IGNORECASE,
+)
+# 方向标准化（匹配结果已转小写）
+_DIRECTION_MAP = {
+    "buy": "buy", "买入": "buy",
+    "sell": "sell", "卖出": "sell",
+    "hold": "hold", "持有": "hold", "空仓": "hold",
+}
+
+# 账户资金字段（按优先级），取第一个为正的值
+_CAPITAL_KEYS = ("power", "BuyingPower", "cash", "available_cash", "total_assets")
+
+# 输出清理模式："## 最终决策" / "## 决策详情" 及其后的内容，直到下一个 "## 决策详情"、"## 决策依据" 或结尾
+_STRIP_SECTIONS_RE = re.compile(r'##\s*(?:最终决策|决策详情)[\s\S]*?(?=##\s*决策详情|##\s*决策依据|$)', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """点号路径只在首次使用时拆分，调用方传入的都是固定字面量"""
+    return tuple(path.split("."))
 
 
 def _safe_get(d: Dict[str, Any], path: str, default: Any = None) -> Any:
     cur: Any = d
-    for p in path.split("."):
-        if not isinstance(cur, dict) or p not in cur:
-            return default
-        cur = cur[p]
+    # 路径通常存在，直接取值，缺失或遇到非映射类型时再回退到默认值
+    try:
+        for p in _split_path(path):
+            cur = cur[p]
+    except (KeyError, TypeError, IndexError):
+        return default
     return cur
 
 
+def _search_by_priority(pattern: re.Pattern, text: str) -> Optional[str]:
+    """单次扫描返回优先级最高分支的首个匹配值，与按优先级逐个模式 search 的结果一致。"""
+    best = None
+    for match in pattern.finditer(text):
+        if best is None or match.lastindex < best.lastindex:
+            best = match
+            if best.lastindex == 1:
+                break
+    return best.group(best.lastindex) if best else None
+
+
 def _extract_fields_from_text(text: str) -> Dict[str, Any]:
     """从文本中提取字段，支持多种格式（Markdown、普通文本、中文冒号）。"""
+    # 同一段摘要在一次决策中会被多处解析，结果按文本缓存；返回副本以免调用方修改缓存
+    return dict(_extract_fields_cached(text))
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_fields_cached(text: str) -> Dict[str, Any]:
     fields = {"confidence": None, "stop_loss": None, "take_profit": None, "position": None, "direction": None}
     
-    # 支持的格式模式（按优先级）
-    patterns = {
-        "position": [
-            r'\*\*仓位权重\*\*[：:]\s*(\d+(?:\.\d+)?)%?',  # Markdown格式: **仓位权重**: 65%
-            r'仓位权重[：:]\s*(\d+(?:\.\d+)?)%?',  # 普通格式: 仓位权重: 65% 或 仓位权重：65%
-        ],
-        "stop_loss": [
-            r'\*\*止损价格\*\*[：:]\s*(\d+(?:\.\d+)?)',  # Markdown格式: **止损价格**: 645.0
-            r'止损价格[：:]\s*(\d+(?:\.\d+)?)',  # 普通格式: 止损价格: 645.0
-        ],
-        "take_profit": [
-            r'\*\*止盈目标\*\*[：:]\s*(\d+(?:\.\d+)?)',  # Markdown格式: **止盈目标**: 635.0
-            r'止盈目标[：:]\s*(\d+(?:\.\d+)?)',  # 普通格式: 止盈目标: 635.0
-        ],
-        "confidence": [
-            r'\*\*信心度\*\*[：:]\s*(\d+(?:\.\d+)?)%?',  # Markdown格式: **信心度**: 78%
-            r'信心度[：:]\s*(\d+(?:\.\d+)?)%?',  # 普通格式: 信心度: 78%
-        ],
-        "direction": [
-            r'\*\*操作方向\*\*[：:]\s*(buy|sell|hold|买入|卖出|持有)',  # Markdown格式
-            r'操作方向[：:]\s*(buy|sell|hold|买入|卖出|持有)',  # 普通格式
-            r'方向[：:]\s*(buy|sell|hold|买入|卖出|持有)',
-        ],
-    }
-    
+    # 每个模式都包含对应的字段名，先用子串判断跳过不含该字段的文本
     # 提取仓位权重
-    for pattern in patterns["position"]:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                fields["position"] = match.group(1)
-                break
-            except (ValueError, TypeError, IndexError):
-                pass
+    if "仓位权重" in text:
+        value = _search_by_priority(_POSITION_RE, text)
+        if value:
+            fields["position"] = value
     
     # 提取止损价格
-    for pattern in patterns["stop_loss"]:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                fields["stop_loss"] = float(match.group(1))
-                break
-            except (ValueError, TypeError, IndexError):
-                pass
+    if "止损价格" in text:
+        value = _search_by_priority(_STOP_LOSS_RE, text)
+        if value:
+            fields["stop_loss"] = float(value)
     
     # 提取止盈目标
-    for pattern in patterns["take_profit"]:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                fields["take_profit"] = float(match.group(1))
-                break
-            except (ValueError, TypeError, IndexError):
-                pass
+    if "止盈目标" in text:
+        value = _search_by_priority(_TAKE_PROFIT_RE, text)
+        if value:
+            fields["take_profit"] = float(value)
     
     # 提取信心度
-    for pattern in patterns["confidence"]:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                conf_val = float(match.group(1))
-                fields["confidence"] = conf_val / 100.0 if conf_val > 1 else conf_val
-                break
-            except (ValueError, TypeError, IndexError):
-                pass
+    if "信心度" in text:
+        value = _search_by_priority(_CONFIDENCE_RE, text)
+        if value:
+            conf_val = float(value)
+            fields["confidence"] = conf_val / 100.0 if conf_val > 1 else conf_val
     
-    # 提取操作方向
-    for pattern in patterns["direction"]:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                direction_str = match.group(1).lower()
-                # 标准化方向
-                if direction_str in ("buy", "买入"):
-                    fields["direction"] = "buy"
-                elif direction_str in ("sell", "卖出"):
-                    fields["direction"] = "sell"
-                elif direction_str in ("hold", "持有", "空仓"):
-                    fields["direction"] = "hold"
-                break
-            except (ValueError, TypeError, IndexError):
-                pass
+    # 提取操作方向（“操作方向”也包含“方向”）
+    if "方向" in text:
+        value = _search_by_priority(_DIRECTION_RE, text)
+        if value:
+            # 标准化方向
+            fields["direction"] = _DIRECTION_MAP.get(value.lower())
     
     return fields
 
 
+def _strip_code_fences(text: str) -> str:
+    """移除成对的 ``` 代码围栏块，未闭合的围栏原样保留（与 re.sub(r"```[\s\S]*?```", "", text) 等价）。"""
+    start = text.find("```")
+    if start < 0:
+        return text
+    parts = []
+    pos = 0
+    while start >= 0:
+        end = text.find("```", start + 3)
+        if end < 0:
+            break
+        parts.append(text[pos:start])
+        pos = end + 3
+        start = text.find("```", pos)
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
 def _normalize_ai_output(ai: Dict[str, Any]) -> Dict[str, Any]:
     """从AI返回中提炼用于展示的字段，避免原始JSON直出。"""
     out = ai.get("output")
@@ -121,8 +138,7 @@ def _normalize_ai_output(ai: Dict[str, Any]) -> Dict[str, Any]:
         result["position"] = out.get("position") or out.get("position_weight") or out.get("size")
     elif isinstance(out, str):
         # 文本：去掉围栏/多余转义
-        summary_text = out.strip()
-        summary_text = re.sub(r"```[\s\S]*?```", "", summary_text)  # 移除代码围栏块
+        summary_text = _strip_code_fences(out)  # 移除代码围栏块
         summary_text = summary_text.replace("\\n", "\n")
     else:
         # 兜底：尽量不输出JSON
@@ -131,10 +147,12 @@ def _normalize_ai_output(ai: Dict[str, Any]) -> Dict[str, Any]:
         except Exception:
             summary_text = str(out)
     
+    # 首尾空白只去除一次，后续清理与提取都基于该文本
+    summary_text = summary_text.strip()
+    
     # 先从原始文本中提取字段（在清理前提取，确保能正确提取）
-    original_text = summary_text.strip()
-    if original_text and ("决策详情" in original_text or "仓位权重" in original_text or "止损价格" in original_text):
-        extracted = _extract_fields_from_text(original_text)
+    if summary_text and ("决策详情" in summary_text or "仓位权重" in summary_text or "止损价格" in summary_text):
+        extracted = _extract_fields_from_text(summary_text)
         # 只有在字段还未设置时才使用提取的值
         if not result.get("position") and extracted.get("position"):
             result["position"] = extracted["position"]
@@ -146,11 +164,8 @@ def _normalize_ai_output(ai: Dict[str, Any]) -> Dict[str, Any]:
             result["confidence"] = extracted["confidence"]
     
     # 清理文本：移除"最终决策"和"决策详情"部分，只保留"决策依据"
-    summary_text = summary_text.strip()
-    # 移除 "## 最终决策" 及其后的内容，直到 "## 决策详情" 或 "## 决策依据"
-    summary_text = re.sub(r'##\s*最终决策[\s\S]*?(?=##\s*决策详情|##\s*决策依据|$)', '', summary_text, flags=re.IGNORECASE)
-    # 移除 "## 决策详情" 及其后的内容，直到 "## 决策依据"
-    summary_text = re.sub(r'##\s*决策详情[\s\S]*?(?=##\s*决策依据|$)', '', summary_text, flags=re.IGNORECASE)
+    # 一次扫描同时移除 "## 最终决策" 与 "## 决策详情" 两部分
+    summary_text = _STRIP_SECTIONS_RE.sub('', summary_text)
     # 清理多余的空白和换行
     summary_text = summary_text.strip()
     # 如果没有保留任何内容（或者只保留了空白），则summary为空
@@ -178,6 +193,10 @@ def format_ai_decision(evt_data: Dict[str, Any]) -> str:
     direction_match = evt_data.get("direction_match", False)
     fusion_type = evt_data.get("fusion_type", "unknown")
     
+    # AI输出只规范化一次，摘要中的字段按需提取一次
+    normalized = _normalize_ai_output(ai)
+    ai_fields = None
+    
     # 优先使用融合信号，如果没有则使用AI输出
     if fused_signal:
         direction = fused_signal.get("direction", "")
@@ -186,9 +205,8 @@ def format_ai_decision(evt_data: Dict[str, Any]) -> str:
         stop_loss = fused_signal.get("stop_loss", 0)
         take_profit = fused_signal.get("take_profit", 0)
     else:
-        normalized = _normalize_ai_output(ai)
         # 尝试从AI输出中提取方向
-        ai_fields = _extract_fields_from_text(str(normalized.get("summary", "")))
+        ai_fields = _extract_fields_from_text(normalized["summary"])
         direction = ai_fields.get("direction") or strategy_action  # 优先使用AI方向，否则用策略动作
         confidence = normalized.get("confidence", 0)
         if confidence and isinstance(confidence, float) and confidence <= 1:
@@ -198,7 +216,6 @@ def format_ai_decision(evt_data: Dict[str, Any]) -> str:
         take_profit = normalized.get("take_profit", 0)
     
     # 获取AI输出的摘要（用于显示决策依据）
-    normalized = _normalize_ai_output(ai)
     summary = normalized.get('summary', '').strip()
     
     # 账户信息
@@ -206,15 +223,21 @@ def format_ai_decision(evt_data: Dict[str, Any]) -> str:
     if account is None:
         account = evt_data.get("account") or {}
     capital_value = None
-    for key in ["power", "BuyingPower", "cash", "available_cash", "total_assets"]:
-        val = account.get(key) if isinstance(account, dict) else None
-        if val is not None:
-            try:
+    if isinstance(account, dict):
+        for key in _CAPITAL_KEYS:
+            val = account.get(key)
+            if val is None:
+                continue
+            if isinstance(val, (int, float)):
+                # 数值直接使用，只有字符串等其他类型才需要尝试转换
                 capital_value = float(val)
-                if capital_value > 0:
-                    break
-            except (ValueError, TypeError):
-                pass
+            else:
+                try:
+                    capital_value = float(val)
+                except (ValueError, TypeError):
+                    continue
+            if capital_value > 0:
+                break
     
     capital = f"{capital_value:,.2f}" if capital_value and capital_value > 0 else "-"
     
@@ -226,7 +249,8 @@ def format_ai_decision(evt_data: Dict[str, Any]) -> str:
     if ai_signal:
         ai_dir = ai_signal.get("direction", "").upper()
     else:
-        ai_fields = _extract_fields_from_text(str(normalized.get("summary", "")))
+        if ai_fields is None:
+            ai_fields = _extract_fields_from_text(normalized["summary"])
         ai_dir = ai_fields.get("direction", "").upper() if ai_fields.get("direction") else "-"
     
     # 融合类型中文映射
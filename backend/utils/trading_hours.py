@@ -5,12 +5,13 @@
 
 from __future__ import annotations
 
+import functools
 import logging
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
+from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Tuple
-
-import pytz
+from zoneinfo import ZoneInfo
 
 try:
     import exchange_calendars as ec
@@ -27,6 +28,37 @@ class MarketType(Enum):
     CN = "CN"  # A股
 
 
+@functools.lru_cache(maxsize=64)
+def _calendar_is_session(calendar, check_date: date) -> bool:
+    """查询交易日历，结果按 (日历, 日期) 缓存；同一轮调度会反复查询同一天"""
+    return bool(calendar.is_session(check_date))
+
+
+def _time_of_day_us(t) -> int:
+    """当日零点起的微秒数（接受 time 或 datetime）"""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+def _seconds_between(start: datetime, end: datetime) -> float:
+    """
+    两个时刻之间的秒数
+    同一 ZoneInfo 的 aware datetime 直接相减按墙上时间计算，跨夏令时切换会差一小时，因此先转为 UTC
+    """
+    return (end.astimezone(timezone.utc) - start.astimezone(timezone.utc)).total_seconds()
+
+
+@dataclass(frozen=True)
+class TradingSnapshot:
+    """同一时刻的交易时间状态，调度循环每轮取一次即可读取全部字段"""
+    now: datetime
+    is_trading_day: bool
+    is_trading_time: bool
+    open_time: Optional[datetime]  # 今日开盘时间，非交易日为None
+    close_time: Optional[datetime]  # 今日收盘时间，非交易日为None
+    seconds_until_open: float
+    seconds_until_close: float
+
+
 class TradingHoursManager:
     """交易时间管理器"""
     
@@ -40,9 +72,19 @@ class TradingHoursManager:
             enable_holiday_check: 是否启用节假日检查
         """
         self.market = MarketType(market.upper())
-        self.tz = pytz.timezone(timezone)
+        self.tz = ZoneInfo(timezone)
         self.enable_holiday_check = enable_holiday_check and HAS_EXCHANGE_CALENDARS
         self.logger = logging.getLogger(__name__)
+        # 交易时段固定，初始化时计算一次
+        self._hours = self._compute_trading_hours()
+        # 各交易时段的 [开始, 结束]，以当日微秒数表示，供 is_trading_time 做整数比较
+        morning_start, morning_end, afternoon_start, afternoon_end = self._hours
+        sessions = [(morning_start, morning_end)]
+        if afternoon_start and afternoon_end:
+            sessions.append((afternoon_start, afternoon_end))
+        self._session_bounds = tuple((_time_of_day_us(start), _time_of_day_us(end)) for start, end in sessions)
+        # 最近一个交易日的 (日期, 开盘时间, 收盘时间)，同一天内的查询直接复用
+        self._day_times: Optional[Tuple[date, datetime, datetime]] = None
         
         # 初始化交易日历（如果支持）
         self.calendar = None
@@ -70,6 +112,10 @@ class TradingHoursManager:
             (早盘开始, 早盘结束, 午盘开始, 午盘结束)
             如果只有一段交易时间，午盘开始和结束为None
         """
+        return self._hours
+    
+    def _compute_trading_hours(self) -> Tuple[time, time, Optional[time], Optional[time]]:
+        """按市场类型确定交易时段，仅在初始化时调用"""
         if self.market == MarketType.HK:
             # 港股：09:30-12:00, 13:00-16:00 HKT
             return (time(9, 30), time(12, 0), time(13, 0), time(16, 0))
@@ -102,8 +148,7 @@ class TradingHoursManager:
         if self.enable_holiday_check and self.calendar:
             try:
                 # 检查是否为交易日
-                is_open = self.calendar.is_session(check_date)
-                return is_open
+                return _calendar_is_session(self.calendar, check_date)
             except Exception as e:
                 self.logger.warning(f"交易日历检查失败: {e}，使用简化逻辑")
         
@@ -129,26 +174,74 @@ class TradingHoursManager:
             check_time = self._get_now()
         
         # 首先检查是否为交易日
-        if not self.is_trading_day(check_time):
-            return False
-        
-        # 获取交易时间
-        morning_start, morning_end, afternoon_start, afternoon_end = self._get_market_trading_hours()
-        
-        # 获取当前时间（本地时区）
-        current_time = check_time.time()
-        
-        # 检查是否在早盘交易时间
-        if morning_start <= current_time <= morning_end:
-            return True
-        
-        # 检查是否在午盘交易时间（如果有）
-        if afternoon_start and afternoon_end:
-            if afternoon_start <= current_time <= afternoon_end:
+        return self.is_trading_day(check_time) and self._in_session(check_time)
+    
+    def _in_session(self, check_time: datetime) -> bool:
+        """不考虑交易日，只判断时刻是否在早盘/午盘交易时间内（本地时区，整数比较）"""
+        current = _time_of_day_us(check_time)
+        for start, end in self._session_bounds:
+            if start <= current <= end:
                 return True
-        
         return False
     
+    def _open_time_on(self, day: date) -> datetime:
+        """指定日期的开盘时间（不检查是否为交易日）"""
+        return datetime.combine(day, self._hours[0], tzinfo=self.tz)
+    
+    def _close_time_on(self, day: date) -> datetime:
+        """指定日期的收盘时间（不检查是否为交易日）：只有一段交易时间时为早盘结束，否则为午盘结束"""
+        _, morning_end, _, afternoon_end = self._hours
+        return datetime.combine(day, afternoon_end or morning_end, tzinfo=self.tz)
+    
+    def _session_times(self, day: date) -> Tuple[datetime, datetime]:
+        """指定日期的 (开盘时间, 收盘时间)，按日期缓存最近一天"""
+        cached = self._day_times
+        if cached is None or cached[0] != day:
+            cached = self._day_times = (day, self._open_time_on(day), self._close_time_on(day))
+        return cached[1], cached[2]
+    
+    def snapshot(self, now: Optional[datetime] = None) -> TradingSnapshot:
+        """
+        一次性计算某一时刻的交易时间状态，避免逐个调用查询方法时重复取时间、查交易日历
+        
+        Args:
+            now: 时刻，如果为None则使用当前时间
+        
+        Returns:
+            TradingSnapshot
+        """
+        if now is None:
+            now = self._get_now()
+        trading_day = self.is_trading_day(now)
+        if not trading_day:
+            return TradingSnapshot(
+                now=now,
+                is_trading_day=False,
+                is_trading_time=False,
+                open_time=None,
+                close_time=None,
+                seconds_until_open=max(0.0, _seconds_between(now, self._next_open_time(now))),
+                seconds_until_close=0.0,
+            )
+        open_time, close_time = self._session_times(now.date())
+        in_session = self._in_session(now)
+        if in_session:
+            seconds_until_open = 0.0
+            seconds_until_close = _seconds_between(now, close_time) if close_time > now else 0.0
+        else:
+            next_open = open_time if open_time > now else self._next_open_time(now)
+            seconds_until_open = max(0.0, _seconds_between(now, next_open))
+            seconds_until_close = 0.0
+        return TradingSnapshot(
+            now=now,
+            is_trading_day=True,
+            is_trading_time=in_session,
+            open_time=open_time,
+            close_time=close_time,
+            seconds_until_open=seconds_until_open,
+            seconds_until_close=seconds_until_close,
+        )
+    
     def get_open_time_today(self) -> Optional[datetime]:
         """
         获取今日开盘时间
@@ -159,14 +252,7 @@ class TradingHoursManager:
         now = self._get_now()
         if not self.is_trading_day(now):
             return None
-        
-        morning_start, _, _, _ = self._get_market_trading_hours()
-        dt = datetime.combine(now.date(), morning_start)
-        # 如果datetime已经是aware的，直接返回；否则本地化
-        if dt.tzinfo is None:
-            return self.tz.localize(dt)
-        else:
-            return dt
+        return self._session_times(now.date())[0]
     
     def get_close_time_today(self) -> Optional[datetime]:
         """
@@ -178,21 +264,7 @@ class TradingHoursManager:
         now = self._get_now()
         if not self.is_trading_day(now):
             return None
-        
-        _, morning_end, afternoon_start, afternoon_end = self._get_market_trading_hours()
-        
-        # 如果只有一段交易时间
-        if not afternoon_end:
-            dt = datetime.combine(now.date(), morning_end)
-        else:
-            # 如果有午盘，返回午盘结束时间
-            dt = datetime.combine(now.date(), afternoon_end)
-        
-        # 如果datetime已经是aware的，直接返回；否则本地化
-        if dt.tzinfo is None:
-            return self.tz.localize(dt)
-        else:
-            return dt
+        return self._session_times(now.date())[1]
     
     def get_next_open_time(self) -> datetime:
         """
@@ -201,32 +273,30 @@ class TradingHoursManager:
         Returns:
             下一个开盘时间
         """
-        now = self._get_now()
-        morning_start, _, _, _ = self._get_market_trading_hours()
+        return self._next_open_time(self._get_now())
+    
+    def _next_open_time(self, now: datetime) -> datetime:
+        """now 之后的下一个开盘时间"""
+        morning_start = self._hours[0]
+        # 今天只有在开盘前才可能是答案，否则直接从明天开始找
+        first_day = 0 if now.time() < morning_start else 1
+        
+        # 有交易日历时直接查询下一个交易日
+        if self.enable_holiday_check and self.calendar:
+            try:
+                session = self.calendar.date_to_session(now.date() + timedelta(days=first_day), direction="next")
+                return self._open_time_on(session.date())
+            except Exception as e:
+                self.logger.warning(f"交易日历查询下一交易日失败: {e}，使用逐日查找")
         
         # 尝试找到下一个交易日
-        for days_ahead in range(0, 10):  # 最多查找10天
-            check_date = now.date() + timedelta(days=days_ahead)
-            dt = datetime.combine(check_date, morning_start)
-            if dt.tzinfo is None:
-                check_datetime = self.tz.localize(dt)
-            else:
-                check_datetime = dt
-            
+        for days_ahead in range(first_day, 10):  # 最多查找10天
+            check_datetime = self._open_time_on(now.date() + timedelta(days=days_ahead))
             if self.is_trading_day(check_datetime):
-                # 如果是今天且当前时间早于开盘时间，返回今天开盘时间
-                if days_ahead == 0 and now.time() < morning_start:
-                    return check_datetime
-                # 否则返回下一个交易日的开盘时间
-                elif days_ahead > 0:
-                    return check_datetime
+                return check_datetime
         
         # 如果找不到（理论上不应该），返回明天
-        dt = datetime.combine(now.date() + timedelta(days=1), morning_start)
-        if dt.tzinfo is None:
-            return self.tz.localize(dt)
-        else:
-            return dt
+        return self._open_time_on(now.date() + timedelta(days=1))
     
     def should_auto_start(self, minutes_before: int = 10) -> bool:
         """
@@ -244,9 +314,7 @@ class TradingHoursManager:
         if not self.is_trading_day(now):
             return False
         
-        open_time = self.get_open_time_today()
-        if open_time is None:
-            return False
+        open_time, _ = self._session_times(now.date())
         
         # 计算开盘前几分钟的时间点
         auto_start_time = open_time - timedelta(minutes=minutes_before)
@@ -262,19 +330,22 @@ class TradingHoursManager:
             距离开盘的秒数（如果是非交易日或已开盘，返回0）
         """
         now = self._get_now()
+        # 同一次调用内只查询一次交易日
+        trading_day = self.is_trading_day(now)
         
         # 如果已经在交易时间内，返回0
-        if self.is_trading_time(now):
+        if trading_day and self._in_session(now):
             return 0.0
         
         # 获取今日开盘时间
-        open_time_today = self.get_open_time_today()
-        if open_time_today and open_time_today > now:
-            return (open_time_today - now).total_seconds()
+        if trading_day:
+            open_time_today, _ = self._session_times(now.date())
+            if open_time_today > now:
+                return _seconds_between(now, open_time_today)
         
         # 如果今日已过或非交易日，获取下一个开盘时间
-        next_open = self.get_next_open_time()
-        return max(0.0, (next_open - now).total_seconds())
+        next_open = self._next_open_time(now)
+        return max(0.0, _seconds_between(now, next_open))
     
     def get_seconds_until_close(self) -> float:
         """
@@ -289,9 +360,9 @@ class TradingHoursManager:
         if not self.is_trading_time(now):
             return 0.0
         
-        close_time = self.get_close_time_today()
-        if close_time and close_time > now:
-            return (close_time - now).total_seconds()
+        _, close_time = self._session_times(now.date())
+        if close_time > now:
+            return _seconds_between(now, close_time)
         
         return 0.0
     
@@ -306,15 +377,12 @@ class TradingHoursManager:
             距离自动停止的秒数（如果已到或未到收盘时间，返回相应值）
         """
         now = self._get_now()
-        close_time = self.get_close_time_today()
-        
-        if close_time is None:
+        if not self.is_trading_day(now):
             return 0.0
         
-        auto_stop_time = close_time + timedelta(minutes=minutes_after_close)
+        auto_stop_time = self._session_times(now.date())[1] + timedelta(minutes=minutes_after_close)
         
         if auto_stop_time <= now:
             return 0.0  # 已到停止时间
         
-        return (auto_stop_time - now).total_seconds()
-
+        return _seconds_between(now, auto_stop_time)
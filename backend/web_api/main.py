@@ -2,12 +2,23 @@
 FastAPI主应用
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 import uvicorn
+import asyncio
 import logging
+import os
+import time
 from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from .routes import auth, trading, strategies, backtesting, monitoring
 from ..core.event_engine.event_manager import EventManager
@@ -17,25 +28,25 @@ from ..monitoring.health_check import HealthChecker
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 全局变量
-event_manager = None
-health_checker = None
+# 健康检查结果短时缓存：探针频繁调用时，窗口内的请求共享同一次检查
+HEALTH_CACHE_TTL = 0.5  # 秒
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
-    global event_manager, health_checker
-    
-    # 启动时初始化
+    # 启动时初始化（运行期对象挂在 app.state 上，每个 worker 进程各自初始化）
     logger.info("启动量化交易系统...")
     
     # 初始化事件管理器
     event_manager = EventManager()
     await event_manager.start()
+    app.state.event_manager = event_manager
     
-    # 初始化健康检查
-    health_checker = HealthChecker()
+    # 初始化健康检查（锁在事件循环内创建）
+    app.state.health_checker = HealthChecker()
+    app.state.health_cache = {"ts": 0.0, "value": None}
+    app.state.health_lock = asyncio.Lock()
     
     logger.info("系统启动完成")
     
@@ -43,17 +54,32 @@ async def lifespan(app: FastAPI):
     
     # 关闭时清理
     logger.info("关闭量化交易系统...")
-    if event_manager:
-        await event_manager.stop()
+    await event_manager.stop()
     logger.info("系统已关闭")
 
 
-# 创建FastAPI应用
+def get_health_checker(request: Request) -> Optional[HealthChecker]:
+    """依赖注入：获取健康检查器（应用启动前为 None）"""
+    return getattr(request.app.state, "health_checker", None)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    用 orjson 序列化的 JSON 响应
+    路由返回值已先经 jsonable_encoder 转成基础类型（Decimal 等在此之前已转为 float），这里只负责更快地编码
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# 创建FastAPI应用（安装了 orjson 时用其序列化响应，否则使用标准库 json）
 app = FastAPI(
     title="量化交易系统API",
     description="基于Webull、富途和DeepSeek的智能量化交易系统",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse,
 )
 
 # 添加中间件
@@ -65,7 +91,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# 响应多为几 KB 的 JSON，压缩级别 1 的 CPU 开销约为默认级别 9 的一小部分，压缩率相差不大
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=1)
 
 # 注册路由
 app.include_router(auth.router, prefix="/api/auth", tags=["认证"])
@@ -86,11 +113,22 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(
+    request: Request,
+    health_checker: Optional[HealthChecker] = Depends(get_health_checker),
+):
     """健康检查"""
-    if health_checker:
-        return await health_checker.check_health()
-    return {"status": "ok"}
+    if not health_checker:
+        return {"status": "ok"}
+    cache = request.app.state.health_cache
+    if time.monotonic() - cache["ts"] < HEALTH_CACHE_TTL:
+        return cache["value"]
+    async with request.app.state.health_lock:
+        # 等锁期间可能已有其他请求完成了检查
+        if time.monotonic() - cache["ts"] >= HEALTH_CACHE_TTL:
+            cache["value"] = await health_checker.check_health()
+            cache["ts"] = time.monotonic()
+    return cache["value"]
 
 
 if __name__ == "__main__":
@@ -98,6 +136,9 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # uvicorn[standard] 自带 uvloop；auto 在可用时使用 uvloop，Windows 上回退到 asyncio
+        loop="auto",
+        # 热重载会持续轮询文件变化，仅在开发环境（DEV=1）开启
+        reload=os.environ.get("DEV", "0") == "1",
         log_level="info"
     )
@@ -2,20 +2,73 @@
 交易相关类型定义
 """
 
+import sys
+import time
+from collections import deque
 from enum import Enum
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
-from datetime import datetime
+from typing import Optional, Dict, Any, Deque
+from dataclasses import InitVar, dataclass, field, fields, is_dataclass
+from datetime import datetime, timezone
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
 
-class OrderSide(Enum):
+# Python 3.10+ 用 __slots__ 存储字段（无实例 __dict__，更省内存、属性访问更快）；3.9 退化为普通 dataclass
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _ns_to_datetime(ns: int) -> datetime:
+    """纳秒时间戳转本地时间 datetime（精确到微秒，避免浮点除法的舍入误差）"""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
+def _datetime_to_ns(value: datetime) -> int:
+    """datetime 转纳秒时间戳（无时区视为本地时间）"""
+    return int(value.timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def _ns_datetime_property(ns_field: str) -> property:
+    """以 datetime 读写 *_at_ns 整数时间戳字段的属性"""
+    def fget(self) -> datetime:
+        return _ns_to_datetime(getattr(self, ns_field))
+
+    def fset(self, value: datetime) -> None:
+        setattr(self, ns_field, _datetime_to_ns(value))
+
+    return property(fget, fset)
+
+
+def to_dict(obj: Any) -> Any:
+    """
+    转为字典（替代 dataclasses.asdict）
+    *_at_ns 时间戳还原为去掉 _ns 后缀的 datetime 字段，与改为整数存储前的字段一致；deque 转为列表
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        result = {}
+        for f in fields(obj):
+            value = getattr(obj, f.name)
+            if f.name.endswith("_at_ns"):
+                result[f.name[:-3]] = _ns_to_datetime(value)
+            else:
+                result[f.name] = to_dict(value)
+        return result
+    if isinstance(obj, (list, tuple, deque)):
+        return [to_dict(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: to_dict(v) for k, v in obj.items()}
+    return obj
+
+
+# 枚举混入 str：成员本身就是其取值字符串，序列化（json.dumps、API 响应）时无需再取 .value
+class OrderSide(str, Enum):
     """订单方向"""
     BUY = "buy"
     SELL = "sell"
 
 
-class OrderType(Enum):
+class OrderType(str, Enum):
     """订单类型"""
     MARKET = "market"
     LIMIT = "limit"
@@ -23,7 +76,7 @@ class OrderType(Enum):
     STOP_LIMIT = "stop_limit"
 
 
-class OrderStatus(Enum):
+class OrderStatus(str, Enum):
     """订单状态"""
     PENDING = "pending"
     SUBMITTED = "submitted"
@@ -33,13 +86,13 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
 
 
-class PositionSide(Enum):
+class PositionSide(str, Enum):
     """持仓方向"""
     LONG = "long"
     SHORT = "short"
 
 
-class MarketType(Enum):
+class MarketType(str, Enum):
     """市场类型"""
     STOCK = "stock"
     OPTION = "option"
@@ -47,7 +100,7 @@ class MarketType(Enum):
     CRYPTO = "crypto"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Order:
     """订单数据类"""
     id: str
@@ -60,19 +113,35 @@ class Order:
     status: OrderStatus = OrderStatus.PENDING
     filled_quantity: Decimal = Decimal('0')
     average_price: Optional[Decimal] = None
-    created_at: datetime = None
-    updated_at: datetime = None
+    # 时间戳以 time.time_ns() 整数保存，创建时不构造 datetime；
+    # 仍可按原参数名传入 datetime，created_at / updated_at 属性按 datetime 读写
+    created_at: InitVar[Optional[datetime]] = None
+    updated_at: InitVar[Optional[datetime]] = None
     strategy_id: Optional[str] = None
     client_order_id: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+    created_at_ns: int = 0
+    updated_at_ns: int = 0
+
+    def __post_init__(self, created_at: Optional[datetime], updated_at: Optional[datetime]) -> None:
+        if created_at is None and updated_at is None and not (self.created_at_ns or self.updated_at_ns):
+            # 新订单：只读一次时钟，创建与更新时间相同
+            self.created_at_ns = self.updated_at_ns = time.time_ns()
+            return
+        if created_at is not None:
+            self.created_at_ns = _datetime_to_ns(created_at)
+        if updated_at is not None:
+            self.updated_at_ns = _datetime_to_ns(updated_at)
+        if not (self.created_at_ns and self.updated_at_ns):
+            now = time.time_ns()
+            self.created_at_ns = self.created_at_ns or now
+            self.updated_at_ns = self.updated_at_ns or now
+
+
+Order.created_at = _ns_datetime_property("created_at_ns")
+Order.updated_at = _ns_datetime_property("updated_at_ns")
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Position:
     """持仓数据类"""
     symbol: str
@@ -83,31 +152,152 @@ class Position:
     realized_pnl: Decimal = Decimal('0')
     side: PositionSide = PositionSide.LONG
     market_type: MarketType = MarketType.STOCK
-    updated_at: datetime = None
-    
-    def __post_init__(self):
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+    updated_at: InitVar[Optional[datetime]] = None
+    updated_at_ns: int = 0
+
+    def __post_init__(self, updated_at: Optional[datetime]) -> None:
+        if updated_at is not None:
+            self.updated_at_ns = _datetime_to_ns(updated_at)
+        elif not self.updated_at_ns:
+            self.updated_at_ns = time.time_ns()
+
 
+Position.updated_at = _ns_datetime_property("updated_at_ns")
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class MarketData:
-    """市场数据类"""
+    """
+    市场数据类（创建后不可变）
+    行情是高频数据且只用于计算，价格用 float；订单、成交、账户等结算相关类型仍用 Decimal
+    """
     symbol: str
-    price: Decimal
+    price: float
     volume: int
     timestamp: datetime
-    bid: Optional[Decimal] = None
-    ask: Optional[Decimal] = None
-    high: Optional[Decimal] = None
-    low: Optional[Decimal] = None
-    open: Optional[Decimal] = None
-    close: Optional[Decimal] = None
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    open: Optional[float] = None
+    close: Optional[float] = None
 
 
-@dataclass
+class MarketDataBuffer:
+    """
+    单个标的的行情环形缓冲区（列式存储）
+    
+    预分配 NumPy 结构化数组，逐笔写入时不创建 MarketData 对象；
+    写满后覆盖最早的数据。缺失的报价字段记为 NaN，带时区的时间戳统一转为 UTC 存储。
+    """
+    
+    DTYPE = np.dtype([
+        ("timestamp", "datetime64[ns]"),
+        ("price", "f8"),
+        ("volume", "i8"),
+        ("bid", "f8"),
+        ("ask", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("open", "f8"),
+        ("close", "f8"),
+    ])
+    
+    def __init__(self, symbol: str, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity 必须为正数")
+        self.symbol = symbol
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=self.DTYPE)
+        self._next = 0  # 下一个写入位置
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(
+        self,
+        price: float,
+        volume: int,
+        timestamp: datetime,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        open: Optional[float] = None,
+        close: Optional[float] = None,
+    ) -> None:
+        """写入一笔行情"""
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        nan = np.nan
+        self._buf[self._next] = (
+            np.datetime64(timestamp, "ns"),
+            price,
+            volume,
+            nan if bid is None else bid,
+            nan if ask is None else ask,
+            nan if high is None else high,
+            nan if low is None else low,
+            nan if open is None else open,
+            nan if close is None else close,
+        )
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+    
+    def append_market_data(self, data: MarketData) -> None:
+        """写入一个 MarketData 对象"""
+        self.append(
+            data.price, data.volume, data.timestamp,
+            bid=data.bid, ask=data.ask, high=data.high, low=data.low, open=data.open, close=data.close,
+        )
+    
+    def to_array(self) -> np.ndarray:
+        """按时间顺序返回缓冲区内容；未发生回绕时为底层数组的视图（不复制）"""
+        if self._size < self.capacity:
+            return self._buf[:self._size]
+        return np.concatenate((self._buf[self._next:], self._buf[:self._next]))
+    
+    def column(self, name: str) -> np.ndarray:
+        """按时间顺序返回单列（连续数组，可直接交给指标计算）"""
+        return np.ascontiguousarray(self.to_array()[name])
+    
+    def as_dataframe(self):
+        """按时间顺序返回以时间戳为索引的 DataFrame（索引不带时区：带时区的输入已转为 UTC，无时区的输入原样保留）"""
+        records = self.to_array()
+        return pd.DataFrame(
+            {name: records[name] for name in self.DTYPE.names[1:]},
+            index=pd.DatetimeIndex(records["timestamp"], name="timestamp"),
+        )
+    
+    def latest(self) -> Optional[MarketData]:
+        """最新一笔行情，转为 MarketData 便于展示或接口返回"""
+        if self._size == 0:
+            return None
+        row = self._buf[self._next - 1]
+        
+        def opt(name: str) -> Optional[float]:
+            value = float(row[name])
+            return None if np.isnan(value) else value
+        
+        return MarketData(
+            symbol=self.symbol,
+            price=float(row["price"]),
+            volume=int(row["volume"]),
+            timestamp=row["timestamp"].astype("datetime64[us]").item(),
+            bid=opt("bid"),
+            ask=opt("ask"),
+            high=opt("high"),
+            low=opt("low"),
+            open=opt("open"),
+            close=opt("close"),
+        )
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Trade:
-    """成交数据类"""
+    """成交数据类（创建后不可变）"""
     id: str
     order_id: str
     symbol: str
@@ -119,19 +309,44 @@ class Trade:
     strategy_id: Optional[str] = None
 
 
-@dataclass
+def _bounded_deque(name: str, items: Deque, maxlen: int) -> Deque:
+    """校验为 deque，容量与 maxlen 不同时按 maxlen 重建（只保留最近的记录）"""
+    if not isinstance(items, deque):
+        raise TypeError(f"{name} 应为 deque，实际为 {type(items).__name__}")
+    return items if items.maxlen == maxlen else deque(items, maxlen=maxlen)
+
+
+@dataclass(**_SLOTS)
 class AccountInfo:
-    """账户信息类"""
+    """
+    账户信息类
+    
+    持仓按标的建索引；订单、成交为有界环形队列，只保留最近的记录。
+    类型与注解不符时抛出 TypeError；传入的队列容量与上限不同时按上限重建。
+    """
     account_id: str
     total_value: Decimal
     cash: Decimal
     buying_power: Decimal
     margin_used: Decimal
-    positions: List[Position]
-    orders: List[Order]
-    trades: List[Trade]
-    updated_at: datetime = None
-    
-    def __post_init__(self):
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+    positions: Dict[str, Position]
+    orders: Deque[Order]
+    trades: Deque[Trade]
+    updated_at: InitVar[Optional[datetime]] = None
+    updated_at_ns: int = 0
+
+    MAX_ORDERS = 10_000
+    MAX_TRADES = 10_000
+
+    def __post_init__(self, updated_at: Optional[datetime]) -> None:
+        if not isinstance(self.positions, dict):
+            raise TypeError(f"positions 应为 Dict[str, Position]，实际为 {type(self.positions).__name__}")
+        self.orders = _bounded_deque("orders", self.orders, self.MAX_ORDERS)
+        self.trades = _bounded_deque("trades", self.trades, self.MAX_TRADES)
+        if updated_at is not None:
+            self.updated_at_ns = _datetime_to_ns(updated_at)
+        elif not self.updated_at_ns:
+            self.updated_at_ns = time.time_ns()
+
+
+AccountInfo.updated_at = _ns_datetime_property("updated_at_ns")
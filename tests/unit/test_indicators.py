@@ -0,0 +1,163 @@
+"""
+指标内核单元测试
+compute_all_indicators 在 JIT 与纯 Python 两种执行方式下都与 pandas 参照实现逐项对比；
+numba、bottleneck 均不可用时策略的回退路径与内核结果一致；
+signal_strength_batch 提前退出时的取舍与完整打分一致
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from backend.strategies.strategy_library.technical import optimized_hk_intraday
+from backend.strategies.strategy_library.technical._indicators_numba import (
+    compute_all_indicators,
+    signal_strength_batch,
+)
+
+RNG = np.random.default_rng(seed=7)
+
+DONCHIAN_WINDOW, RSI_PERIOD, VOLUME_WINDOW, SHORT_WINDOW, LONG_WINDOW = 20, 14, 10, 5, 20
+
+# RSI 与量比以 float32 存储：相对误差上限为 float32 的舍入误差（半个 ulp，约 6e-8），
+# 再留出 float64 滑动和与 pandas rolling 累加顺序不同的余量
+FLOAT32_RTOL = 2 * float(np.finfo(np.float32).eps)
+
+
+def python_kernel(func):
+    """装有 numba 时取 njit 包装下的原始 Python 函数，即 numba 不可用时实际执行的代码"""
+    return getattr(func, "py_func", func)
+
+
+def make_bars(n: int, nan_gaps: int = 0) -> pd.DataFrame:
+    """随机游走行情；nan_gaps 为随机插入的缺失K线段数（每段 1-3 根，各列同时缺失）"""
+    close = np.abs(50 + RNG.standard_normal(n).cumsum()) + 1
+    df = pd.DataFrame({
+        'high': close + RNG.uniform(0, 1, n),
+        'low': close - RNG.uniform(0, 1, n),
+        'close': close,
+        'volume': RNG.integers(100, 10000, n).astype(np.float64),
+    })
+    for _ in range(nan_gaps if n else 0):
+        start = int(RNG.integers(0, n))
+        df.iloc[start:start + int(RNG.integers(1, 4))] = np.nan
+    return df
+
+
+def pandas_reference(df: pd.DataFrame) -> dict:
+    """与策略非 numba 分支相同的 pandas 计算"""
+    close, volume = df['close'], df['volume']
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(RSI_PERIOD).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(RSI_PERIOD).mean()
+    return {
+        'upper': df['high'].rolling(DONCHIAN_WINDOW).max().to_numpy(),
+        'lower': df['low'].rolling(DONCHIAN_WINDOW).min().to_numpy(),
+        'rsi': (100 - 100 / (1 + gain / loss.replace(0, np.nan))).to_numpy(),
+        'volume_ratio': (volume / volume.rolling(VOLUME_WINDOW).mean()).to_numpy(),
+        'short_ma': close.rolling(SHORT_WINDOW).mean().to_numpy(),
+        'long_ma': close.rolling(LONG_WINDOW).mean().to_numpy(),
+        'returns_std': close.pct_change().std(),
+    }
+
+
+def run_kernel(df: pd.DataFrame, jit: bool = True) -> dict:
+    kernel = compute_all_indicators if jit else python_kernel(compute_all_indicators)
+    upper, lower, rsi, volume_ratio, short_ma, long_ma, returns_std = kernel(
+        df['close'].to_numpy(dtype=np.float64),
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['volume'].to_numpy(dtype=np.float64),
+        DONCHIAN_WINDOW, RSI_PERIOD, VOLUME_WINDOW, SHORT_WINDOW, LONG_WINDOW,
+    )
+    return {
+        'upper': upper, 'lower': lower, 'rsi': rsi, 'volume_ratio': volume_ratio,
+        'short_ma': short_ma, 'long_ma': long_ma, 'returns_std': returns_std,
+    }
+
+
+CASES = [
+    pytest.param(0, 0, id="empty"),
+    pytest.param(1, 0, id="single-bar"),
+    pytest.param(12, 0, id="shorter-than-window"),
+    pytest.param(300, 0, id="no-gaps"),
+    pytest.param(300, 5, id="nan-gaps"),
+    pytest.param(60, 3, id="short-with-gaps"),
+]
+
+
+@pytest.mark.parametrize("jit", [True, False], ids=["jit", "pure-python"])
+@pytest.mark.parametrize("n, nan_gaps", CASES)
+def test_compute_all_indicators_matches_pandas(n, nan_gaps, jit):
+    """通道、RSI、量比、均线与收益率标准差均与 pandas 结果一致（含 NaN 位置）"""
+    df = make_bars(n, nan_gaps)
+    got, expected = run_kernel(df, jit), pandas_reference(df)
+
+    # 唐奇安通道只做取值比较，结果必须完全相同
+    np.testing.assert_array_equal(got['upper'], expected['upper'])
+    np.testing.assert_array_equal(got['lower'], expected['lower'])
+    # RSI 与量比以 float32 存储
+    assert got['rsi'].dtype == np.float32 and got['volume_ratio'].dtype == np.float32
+    np.testing.assert_allclose(got['rsi'], expected['rsi'], rtol=FLOAT32_RTOL)
+    np.testing.assert_allclose(got['volume_ratio'], expected['volume_ratio'], rtol=FLOAT32_RTOL)
+    np.testing.assert_allclose(got['short_ma'], expected['short_ma'], rtol=1e-10)
+    np.testing.assert_allclose(got['long_ma'], expected['long_ma'], rtol=1e-10)
+    np.testing.assert_allclose(got['returns_std'], expected['returns_std'], rtol=1e-9)
+
+
+@pytest.mark.parametrize("has_bottleneck", [True, False], ids=["bottleneck", "pandas"])
+@pytest.mark.parametrize("n, nan_gaps", CASES[1:])
+def test_strategy_fallback_matches_kernel(monkeypatch, n, nan_gaps, has_bottleneck):
+    """numba 不可用时策略走 bottleneck / pandas 回退路径，结果与内核一致"""
+    monkeypatch.setattr(optimized_hk_intraday, "HAS_NUMBA", False)
+    monkeypatch.setattr(optimized_hk_intraday, "HAS_BOTTLENECK", has_bottleneck)
+    df = make_bars(n, nan_gaps)
+    analysis = optimized_hk_intraday.OptimizedHKIntradayStrategy().multi_timeframe_analysis(df, DONCHIAN_WINDOW)
+    expected = run_kernel(df, jit=False)
+
+    np.testing.assert_array_equal(analysis['upper_band'], expected['upper'])
+    np.testing.assert_array_equal(analysis['lower_band'], expected['lower'])
+    assert analysis['rsi_14'].dtype == np.float32 and analysis['volume_ma_ratio'].dtype == np.float32
+    np.testing.assert_allclose(analysis['rsi_14'], expected['rsi'], rtol=FLOAT32_RTOL)
+    np.testing.assert_allclose(analysis['volume_ma_ratio'], expected['volume_ratio'], rtol=FLOAT32_RTOL)
+    np.testing.assert_allclose(analysis['volatility'], expected['returns_std'] * np.sqrt(252), rtol=1e-9)
+    trend = optimized_hk_intraday.OptimizedHKIntradayStrategy._classify_trend(
+        df['close'].iat[-1], expected['short_ma'][-1], expected['long_ma'][-1],
+    )
+    assert analysis['price_trend'] == trend
+
+
+@pytest.mark.parametrize("jit", [True, False], ids=["jit", "pure-python"])
+def test_rsi_without_losses_is_nan(jit):
+    """窗口内没有下跌时 RSI 为 NaN（pandas 参照中跌幅均值为 0 被替换为 NaN）"""
+    close = np.linspace(10.0, 20.0, 30)
+    df = pd.DataFrame({'high': close, 'low': close, 'close': close, 'volume': np.ones(30)})
+    assert np.isnan(run_kernel(df, jit)['rsi']).all()
+
+
+def random_candidates(count: int):
+    """随机候选K线：含 NaN、恰好落在各评分分界点上的取值"""
+    close = RNG.uniform(5, 50, count)
+    upper = close * RNG.choice([0.98, 0.99, 0.995, 0.999, 1.0, 1.01], count)
+    lower = close * RNG.choice([1.02, 1.01, 1.005, 1.001, 1.0, 0.99], count)
+    rsi = RNG.choice([np.nan, 10.0, 29.999, 30.0, 50.0, 70.0, 70.001, 90.0], count).astype(np.float32)
+    volume_ratio = RNG.choice([np.nan, 0.5, 0.7, 1.0, 1.3, 1.31, 1.8, 2.5], count).astype(np.float32)
+    upper[RNG.random(count) < 0.05] = np.nan
+    candidates = np.arange(count, dtype=np.int64)
+    is_long = RNG.random(count) < 0.5
+    return close, upper, lower, rsi, volume_ratio, candidates, is_long
+
+
+@pytest.mark.parametrize("threshold", [0.0, 35.0, 55.0, 60.0, 65.0, 80.0, 100.0, 101.0])
+def test_signal_strength_early_exit_keeps_decisions(threshold):
+    """带阈值提前退出时，是否达到阈值的判断与完整打分一致，且达到阈值的得分完全相同"""
+    args = random_candidates(2000)
+    for trend_up in (True, False):
+        for volatility in (0.005, 0.01, 0.03, 0.04, 0.06, np.nan):
+            context = (trend_up, 0.03 + RNG.uniform(-0.01, 0.01), 0.03 + RNG.uniform(-0.01, 0.01), volatility)
+            exact = signal_strength_batch(*args, *context)
+            early = signal_strength_batch(*args, *context, threshold)
+            np.testing.assert_array_equal(early >= threshold, exact >= threshold)
+            passed = exact >= threshold
+            np.testing.assert_array_equal(early[passed], exact[passed])
+            assert (early[~passed] < threshold).all()
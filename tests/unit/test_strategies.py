@@ -5,9 +5,13 @@
 import pytest
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
-from backend.strategies.base_strategy import BaseStrategy, Signal, OrderSide, OrderType
+from backend.strategies.base_strategy import BaseStrategy, Signal
+from backend.strategies.strategy_library.technical import optimized_hk_intraday
+from backend.strategies.strategy_library.technical.optimized_hk_intraday import OptimizedHKIntradayStrategy
+
+# 模块级随机数生成器（PCG64，固定种子）：测试数据可复现，所有随机 fixture 共用
+RNG = np.random.default_rng(seed=42)
 
 
 class TestStrategy(BaseStrategy):
@@ -16,12 +20,13 @@ class TestStrategy(BaseStrategy):
     def generate_signals(self, data: pd.DataFrame):
         """生成测试信号"""
         signals = []
-        if len(data) > 0:
+        closes = data['close'].to_numpy()
+        if len(closes) > 0:
             signal = Signal(
                 symbol="AAPL",
                 action="buy",
                 quantity=100,
-                price=data['close'].iloc[-1],
+                price=closes[-1],
                 confidence=0.8,
                 reason="测试信号"
             )
@@ -33,47 +38,49 @@ class TestStrategy(BaseStrategy):
         return signal.quantity
 
 
+@pytest.fixture(scope="module")
+def sample_ohlcv():
+    """固定种子的测试行情（模块内只构造一次，各测试只读）"""
+    dates = pd.date_range(start='2023-01-01', periods=10, freq='D')
+    return pd.DataFrame({
+        'close': RNG.standard_normal(10).cumsum() + 100,
+        'volume': RNG.integers(1000, 10000, 10)
+    }, index=dates)
+
+
+@pytest.fixture
+def strategy():
+    """每个测试使用独立的策略实例（策略有运行状态和持仓，不能跨测试共享）"""
+    return TestStrategy("test_strategy")
+
+
 class TestBaseStrategy:
     """测试策略基类"""
     
-    def test_strategy_initialization(self):
+    def test_strategy_initialization(self, strategy):
         """测试策略初始化"""
-        strategy = TestStrategy("test_strategy")
         assert strategy.name == "test_strategy"
         assert not strategy.is_running
         assert len(strategy.positions) == 0
         assert len(strategy.signals) == 0
     
-    def test_strategy_start_stop(self):
+    def test_strategy_start_stop(self, strategy):
         """测试策略启动和停止"""
-        strategy = TestStrategy("test_strategy")
-        
         strategy.start()
         assert strategy.is_running
         
         strategy.stop()
         assert not strategy.is_running
     
-    def test_signal_generation(self):
+    def test_signal_generation(self, strategy, sample_ohlcv):
         """测试信号生成"""
-        strategy = TestStrategy("test_strategy")
-        
-        # 创建测试数据
-        dates = pd.date_range(start='2023-01-01', periods=10, freq='D')
-        data = pd.DataFrame({
-            'close': np.random.randn(10).cumsum() + 100,
-            'volume': np.random.randint(1000, 10000, 10)
-        }, index=dates)
-        
-        signals = strategy.generate_signals(data)
+        signals = strategy.generate_signals(sample_ohlcv)
         assert len(signals) == 1
         assert signals[0].symbol == "AAPL"
         assert signals[0].action == "buy"
     
-    def test_position_tracking(self):
+    def test_position_tracking(self, strategy):
         """测试持仓跟踪"""
-        strategy = TestStrategy("test_strategy")
-        
         # 模拟订单成交
         strategy.on_order_filled("order1", "AAPL", 100, 150.0)
         assert strategy.positions["AAPL"] == 100
@@ -81,6 +88,14 @@ class TestBaseStrategy:
         strategy.on_order_filled("order2", "AAPL", 50, 155.0)
         assert strategy.positions["AAPL"] == 150
     
+    def test_get_signals_limit(self, strategy, sample_ohlcv):
+        """测试按数量获取最近信号（与列表切片 signals[-limit:] 一致）"""
+        for _ in range(5):
+            strategy.signals.extend(strategy.generate_signals(sample_ohlcv))
+        history = list(strategy.signals)
+        for limit in (-6, -2, 0, 3, 5, 100):
+            assert strategy.get_signals(limit) == history[-limit:]
+    
     def test_config_update(self):
         """测试配置更新"""
         strategy = TestStrategy("test_strategy", {"param1": 10})
@@ -92,5 +107,74 @@ class TestBaseStrategy:
         assert strategy.config["param2"] == 20
 
 
+
+def make_intraday_bars(seed: int = 2, n: int = 240) -> pd.DataFrame:
+    """固定种子的分钟级随机游走行情（独立的随机数生成器，不受其他测试的抽样顺序影响）"""
+    rng = np.random.default_rng(seed)
+    close = np.abs(50 + rng.standard_normal(n).cumsum()) + 1
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0, 1, n),
+        'low': close - rng.uniform(0, 1, n),
+        'close': close,
+        'volume': rng.integers(100, 10000, n).astype(np.float64),
+    }, index=pd.date_range('2024-03-01 09:30', periods=n, freq='min'))
+
+
+# make_intraday_bars() 在本金 100000、通道窗口 20 下的期望信号（由重构前的逐根实现生成）：
+# (K线位置, 方向, 信号强度, 仓位, 止损, 止盈)
+GOLDEN_SIGNALS = [
+    (26, 'BUY', 70.0, 746, 52.31904337590586, 55.27807123896938),
+    (55, 'BUY', 60.0, 738, 52.87078903486181, 55.86102218519415),
+    (56, 'BUY', 60.0, 707, 55.18867866225934, 58.31000557020679),
+    (220, 'BUY', 75.0, 765, 51.01477439365939, 53.90003622412045),
+    (232, 'BUY', 60.0, 734, 53.1584094446926, 56.164909650990786),
+    (233, 'BUY', 70.0, 721, 54.089256494629865, 57.148402968506474),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "no-numba"])
+def hk_strategy(request, monkeypatch):
+    """港股日内策略；no-numba 时关闭 HAS_NUMBA 并换用打分内核的纯 Python 版本，覆盖回退路径"""
+    if not request.param:
+        kernel = optimized_hk_intraday.signal_strength_batch
+        monkeypatch.setattr(optimized_hk_intraday, "HAS_NUMBA", False)
+        monkeypatch.setattr(optimized_hk_intraday, "signal_strength_batch", getattr(kernel, "py_func", kernel))
+    return OptimizedHKIntradayStrategy(config={'initial_capital': 100000, 'donchian_window': 20})
+
+
+class TestOptimizedHKIntradayStrategy:
+    """港股日内唐奇安突破策略"""
+
+    def test_enhanced_donchian_matches_golden(self, hk_strategy):
+        """整段回测信号与固定行情下的期望结果一致"""
+        df = make_intraday_bars()
+        signals = hk_strategy.enhanced_donchian_strategy(df, 20)
+        got = [
+            (df.index.get_loc(s['timestamp']), s['action'], s['signal_strength'],
+             s['position_size'], s['stop_loss'], s['take_profit'])
+            for s in signals
+        ]
+        assert [g[:4] for g in got] == [g[:4] for g in GOLDEN_SIGNALS]
+        for g, expected in zip(got, GOLDEN_SIGNALS):
+            assert g[4:] == pytest.approx(expected[4:], rel=1e-9)
+
+    def test_last_bar_matches_batch(self, hk_strategy):
+        """逐段截断行情：最新K线的实时评估结果与整段批量结果的最后一根一致"""
+        df = make_intraday_bars()
+        for end in range(21, len(df) + 1):
+            window = df.iloc[:end]
+            batch = hk_strategy.enhanced_donchian_strategy(window, 20)
+            expected = batch[-1] if batch and batch[-1]['timestamp'] == window.index[-1] else None
+            got = hk_strategy._evaluate_last_bar(window, 20)
+            if expected is None:
+                assert got is None, end
+            else:
+                assert got is not None, end
+                assert got.keys() == expected.keys()
+                for key, value in expected.items():
+                    assert got[key] == (pytest.approx(value) if isinstance(value, float) else value), (end, key)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
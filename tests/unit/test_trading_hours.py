@@ -0,0 +1,235 @@
+"""
+交易时间管理单元测试
+夏令时切换日的秒数计算、港股午休边界、跨周末/节假日的下一开盘时间，
+以及 snapshot() 与逐个查询方法在固定时刻下的结果一致
+"""
+
+from datetime import date, datetime, time, timedelta
+
+import pandas as pd
+import pytest
+from zoneinfo import ZoneInfo
+
+from backend.utils.trading_hours import (
+    TradingHoursManager,
+    _seconds_between,
+    _time_of_day_us,
+)
+
+HKT = ZoneInfo("Asia/Hong_Kong")
+ET = ZoneInfo("America/New_York")
+
+
+class FakeCalendar:
+    """交易日历替身：工作日且不在 holidays 中即为交易日，接口与 exchange_calendars 一致"""
+
+    def __init__(self, holidays=()):
+        self.holidays = set(holidays)
+
+    def is_session(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def date_to_session(self, day: date, direction: str = "next") -> pd.Timestamp:
+        assert direction == "next"
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return pd.Timestamp(day)
+
+
+class BrokenCalendar(FakeCalendar):
+    """date_to_session 查询失败的日历，_next_open_time 应回退到逐日查找"""
+
+    def date_to_session(self, day: date, direction: str = "next") -> pd.Timestamp:
+        raise RuntimeError("calendar unavailable")
+
+
+def make_manager(market: str = "HK", tz: str = "Asia/Hong_Kong", calendar=None) -> TradingHoursManager:
+    manager = TradingHoursManager(market=market, timezone=tz)
+    if calendar is not None:
+        manager.calendar = calendar
+        manager.enable_holiday_check = True
+    return manager
+
+
+def at(manager: TradingHoursManager, now: datetime) -> TradingHoursManager:
+    """把管理器的当前时间固定为 now"""
+    manager._get_now = lambda: now
+    return manager
+
+
+class TestSecondsBetween:
+    """_seconds_between 按真实经过的秒数计算"""
+
+    def test_us_spring_forward_day_has_23_hours(self):
+        start = datetime(2024, 3, 9, 12, 0, tzinfo=ET)
+        assert _seconds_between(start, datetime(2024, 3, 10, 12, 0, tzinfo=ET)) == 23 * 3600
+
+    def test_us_fall_back_day_has_25_hours(self):
+        start = datetime(2024, 11, 2, 12, 0, tzinfo=ET)
+        assert _seconds_between(start, datetime(2024, 11, 3, 12, 0, tzinfo=ET)) == 25 * 3600
+
+    def test_mixed_timezones(self):
+        hk_open = datetime(2024, 3, 11, 9, 30, tzinfo=HKT)
+        assert _seconds_between(hk_open, hk_open.astimezone(ET)) == 0.0
+
+
+class TestSessionBounds:
+    """交易时段边界"""
+
+    def test_hk_bounds(self):
+        manager = make_manager()
+        assert manager._session_bounds == (
+            (_time_of_day_us(time(9, 30)), _time_of_day_us(time(12, 0))),
+            (_time_of_day_us(time(13, 0)), _time_of_day_us(time(16, 0))),
+        )
+
+    def test_us_single_session(self):
+        manager = make_manager("US", "America/New_York")
+        assert manager._session_bounds == ((_time_of_day_us(time(9, 30)), _time_of_day_us(time(16, 0))),)
+
+    @pytest.mark.parametrize("moment, expected", [
+        (time(9, 29, 59, 999999), False),
+        (time(9, 30), True),
+        (time(11, 59, 59, 999999), True),
+        (time(12, 0), True),
+        (time(12, 0, 0, 1), False),
+        (time(12, 30), False),
+        (time(12, 59, 59, 999999), False),
+        (time(13, 0), True),
+        (time(16, 0), True),
+        (time(16, 0, 0, 1), False),
+    ])
+    def test_hk_lunch_break_edges(self, moment, expected):
+        """港股午休 12:00-13:00：两端时刻本身算作交易时间（闭区间）"""
+        manager = make_manager()
+        now = datetime.combine(date(2024, 3, 11), moment, tzinfo=HKT)
+        assert manager.is_trading_time(now) is expected
+        assert manager.snapshot(now).is_trading_time is expected
+
+
+class TestSessionTimes:
+    """_session_times 的开收盘时间与按日缓存"""
+
+    def test_hk_open_close(self):
+        manager = make_manager()
+        assert manager._session_times(date(2024, 3, 11)) == (
+            datetime(2024, 3, 11, 9, 30, tzinfo=HKT),
+            datetime(2024, 3, 11, 16, 0, tzinfo=HKT),
+        )
+
+    def test_cache_follows_date(self):
+        manager = make_manager("US", "America/New_York")
+        first = manager._session_times(date(2024, 3, 8))
+        assert manager._day_times == (date(2024, 3, 8), *first)
+        assert manager._session_times(date(2024, 3, 11)) == (
+            datetime(2024, 3, 11, 9, 30, tzinfo=ET),
+            datetime(2024, 3, 11, 16, 0, tzinfo=ET),
+        )
+        assert manager._session_times(date(2024, 3, 8)) == first
+
+    def test_us_open_after_dst_uses_new_offset(self):
+        """夏令时切换后的开盘时间仍是当地 09:30，UTC 偏移随之变化"""
+        manager = make_manager("US", "America/New_York")
+        before, _ = manager._session_times(date(2024, 3, 8))
+        after, _ = manager._session_times(date(2024, 3, 11))
+        assert before.utcoffset() == timedelta(hours=-5)
+        assert after.utcoffset() == timedelta(hours=-4)
+
+
+class TestNextOpenTime:
+    """_next_open_time 跨周末与节假日"""
+
+    @pytest.mark.parametrize("calendar", [None, FakeCalendar(), BrokenCalendar()],
+                             ids=["weekday-rule", "calendar", "calendar-fallback"])
+    def test_across_weekend(self, calendar):
+        manager = make_manager(calendar=calendar)
+        friday_after_close = datetime(2024, 3, 8, 16, 30, tzinfo=HKT)
+        assert manager._next_open_time(friday_after_close) == datetime(2024, 3, 11, 9, 30, tzinfo=HKT)
+
+    def test_before_open_is_today(self):
+        manager = make_manager()
+        assert manager._next_open_time(datetime(2024, 3, 11, 8, 0, tzinfo=HKT)) == datetime(2024, 3, 11, 9, 30, tzinfo=HKT)
+
+    @pytest.mark.parametrize("calendar_cls", [FakeCalendar, BrokenCalendar], ids=["calendar", "calendar-fallback"])
+    def test_across_holiday_and_weekend(self, calendar_cls):
+        """2024 年复活节：周五(3/29)与周一(4/1)休市，周四收盘后下一开盘为周二"""
+        calendar = calendar_cls(holidays={date(2024, 3, 29), date(2024, 4, 1)})
+        manager = make_manager(calendar=calendar)
+        thursday_after_close = datetime(2024, 3, 28, 16, 30, tzinfo=HKT)
+        assert manager._next_open_time(thursday_after_close) == datetime(2024, 4, 2, 9, 30, tzinfo=HKT)
+
+    def test_us_across_dst_weekend(self):
+        """美股周五收盘后到周一开盘跨过夏令时切换，墙上时间差 65.5 小时，实际只经过 64.5 小时"""
+        manager = at(make_manager("US", "America/New_York"), datetime(2024, 3, 8, 16, 0, 1, tzinfo=ET))
+        assert manager._next_open_time(manager._get_now()) == datetime(2024, 3, 11, 9, 30, tzinfo=ET)
+        assert manager.get_seconds_until_open() == 64.5 * 3600 - 1
+        assert manager.snapshot().seconds_until_open == 64.5 * 3600 - 1
+
+
+HOLIDAY_CALENDAR = FakeCalendar(holidays={date(2024, 3, 29), date(2024, 4, 1)})
+
+HK_INSTANTS = [
+    datetime(2024, 3, 11, 8, 0),         # 开盘前
+    datetime(2024, 3, 11, 9, 30),        # 开盘
+    datetime(2024, 3, 11, 11, 59, 59),   # 午休前
+    datetime(2024, 3, 11, 12, 0),        # 早盘收盘
+    datetime(2024, 3, 11, 12, 30),       # 午休
+    datetime(2024, 3, 11, 13, 0),        # 午盘开盘
+    datetime(2024, 3, 11, 16, 0),        # 收盘
+    datetime(2024, 3, 11, 16, 5),        # 收盘后
+    datetime(2024, 3, 9, 10, 0),         # 周六
+    datetime(2024, 3, 29, 10, 0),        # 节假日
+    datetime(2024, 3, 28, 17, 0),        # 节假日前一交易日收盘后
+]
+
+US_INSTANTS = [
+    datetime(2024, 3, 8, 15, 59, 59),    # 夏令时切换前最后一个交易日
+    datetime(2024, 3, 8, 20, 0),
+    datetime(2024, 3, 10, 3, 30),        # 切换当天（周日）
+    datetime(2024, 3, 11, 9, 0),         # 切换后第一个交易日开盘前
+    datetime(2024, 11, 1, 18, 0),
+    datetime(2024, 11, 3, 1, 30),        # 回拨当天重复的一小时
+    datetime(2024, 11, 4, 12, 0),
+]
+
+
+def assert_snapshot_matches_methods(manager: TradingHoursManager, now: datetime) -> None:
+    at(manager, now)
+    snap = manager.snapshot(now)
+    assert snap.now == now
+    assert snap.is_trading_day == manager.is_trading_day(now)
+    assert snap.is_trading_time == manager.is_trading_time(now)
+    assert snap.open_time == manager.get_open_time_today()
+    assert snap.close_time == manager.get_close_time_today()
+    assert snap.seconds_until_open == manager.get_seconds_until_open()
+    assert snap.seconds_until_close == manager.get_seconds_until_close()
+    assert manager.snapshot() == snap
+
+
+class TestSnapshot:
+    """snapshot() 与逐个查询方法结果一致"""
+
+    @pytest.mark.parametrize("calendar", [None, HOLIDAY_CALENDAR], ids=["weekday-rule", "calendar"])
+    @pytest.mark.parametrize("wall_time", HK_INSTANTS, ids=str)
+    def test_hk(self, wall_time, calendar):
+        assert_snapshot_matches_methods(make_manager(calendar=calendar), wall_time.replace(tzinfo=HKT))
+
+    @pytest.mark.parametrize("wall_time", US_INSTANTS, ids=str)
+    def test_us(self, wall_time):
+        assert_snapshot_matches_methods(make_manager("US", "America/New_York"), wall_time.replace(tzinfo=ET))
+
+    def test_in_session_values(self):
+        manager = make_manager()
+        snap = manager.snapshot(datetime(2024, 3, 11, 15, 0, tzinfo=HKT))
+        assert snap.is_trading_time
+        assert snap.seconds_until_open == 0.0
+        assert snap.seconds_until_close == 3600.0
+
+    def test_holiday_values(self):
+        manager = make_manager(calendar=HOLIDAY_CALENDAR)
+        snap = manager.snapshot(datetime(2024, 3, 29, 10, 0, tzinfo=HKT))
+        assert not snap.is_trading_day
+        assert snap.open_time is None and snap.close_time is None
+        assert snap.seconds_until_open == _seconds_between(
+            datetime(2024, 3, 29, 10, 0, tzinfo=HKT), datetime(2024, 4, 2, 9, 30, tzinfo=HKT)
+        )
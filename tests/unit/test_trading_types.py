@@ -0,0 +1,136 @@
+"""
+交易类型单元测试
+"""
+
+import dataclasses
+
+import pytest
+import numpy as np
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from shared.types.trading_types import (
+    AccountInfo,
+    MarketData,
+    MarketDataBuffer,
+    Order,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    to_dict,
+)
+
+START = datetime(2024, 1, 2, 9, 30)
+
+
+def fill(buffer: MarketDataBuffer, count: int) -> None:
+    """写入 count 笔行情，第 i 笔价格为 100 + i、时间为 START 后 i 分钟"""
+    for i in range(count):
+        buffer.append(100.0 + i, 10 * i, START + timedelta(minutes=i), bid=99.0 + i)
+
+
+class TestMarketDataBuffer:
+    """测试行情环形缓冲区"""
+    
+    def test_capacity_must_be_positive(self):
+        with pytest.raises(ValueError):
+            MarketDataBuffer("00700", capacity=0)
+    
+    def test_latest_on_empty_buffer(self):
+        buffer = MarketDataBuffer("00700", capacity=4)
+        assert len(buffer) == 0
+        assert buffer.latest() is None
+        assert len(buffer.to_array()) == 0
+    
+    def test_partial_fill(self):
+        """未写满时按写入顺序返回，最新一笔转为 MarketData，缺失字段为 None"""
+        buffer = MarketDataBuffer("00700", capacity=4)
+        fill(buffer, 3)
+        assert len(buffer) == 3
+        np.testing.assert_array_equal(buffer.column("price"), [100.0, 101.0, 102.0])
+        latest = buffer.latest()
+        assert latest == MarketData(
+            symbol="00700", price=102.0, volume=20, timestamp=START + timedelta(minutes=2), bid=101.0
+        )
+    
+    def test_wrap_around_keeps_time_order(self):
+        """写满后覆盖最早的数据，读取结果仍按写入先后排列"""
+        buffer = MarketDataBuffer("00700", capacity=4)
+        fill(buffer, 6)
+        assert len(buffer) == 4
+        np.testing.assert_array_equal(buffer.column("price"), [102.0, 103.0, 104.0, 105.0])
+        np.testing.assert_array_equal(buffer.column("volume"), [20, 30, 40, 50])
+        assert buffer.latest().price == 105.0
+        # 写入位置回到数组开头时，最新一笔位于底层数组末尾
+        fill(buffer, 2)
+        np.testing.assert_array_equal(buffer.column("price"), [104.0, 105.0, 100.0, 101.0])
+        assert buffer.latest().price == 101.0
+    
+    def test_as_dataframe_converts_aware_timestamps_to_utc(self):
+        """带时区的时间戳以 UTC 存储，DataFrame 索引不带时区；无时区的时间戳原样保留"""
+        buffer = MarketDataBuffer("00700", capacity=4)
+        hk = timezone(timedelta(hours=8))
+        buffer.append(100.0, 1, datetime(2024, 1, 2, 9, 30, tzinfo=hk))
+        buffer.append(101.0, 2, datetime(2024, 1, 2, 1, 31))
+        df = buffer.as_dataframe()
+        assert df.index.tz is None
+        assert list(df.index) == [datetime(2024, 1, 2, 1, 30), datetime(2024, 1, 2, 1, 31)]
+        assert list(df.columns) == ["price", "volume", "bid", "ask", "high", "low", "open", "close"]
+        assert np.isnan(df["ask"]).all()
+
+
+class TestOrderTimestamps:
+    """测试订单时间戳（整数存储，按 datetime 读写）"""
+    
+    def test_new_order_reads_clock_once(self):
+        order = Order("1", "00700", OrderSide.BUY, OrderType.MARKET, Decimal("100"))
+        assert order.created_at_ns == order.updated_at_ns
+        assert abs(order.created_at - datetime.now()) < timedelta(seconds=5)
+    
+    def test_datetime_arguments_and_serialization(self):
+        """仍可按 datetime 传入与赋值；replace 保留原时间戳；to_dict 输出 datetime 字段"""
+        created = datetime(2024, 1, 2, 9, 30, 0, 123456)
+        order = Order("1", "00700", OrderSide.BUY, OrderType.LIMIT, Decimal("100"), created_at=created)
+        assert order.created_at == created
+        filled = dataclasses.replace(order, status=OrderStatus.FILLED)
+        assert filled.created_at == created and filled.updated_at == order.updated_at
+        order.updated_at = created + timedelta(minutes=1)
+        data = to_dict(order)
+        assert data["created_at"] == created
+        assert data["updated_at"] == created + timedelta(minutes=1)
+        assert "created_at_ns" not in data
+
+
+def make_account(**overrides) -> AccountInfo:
+    fields = dict(
+        account_id="A1", total_value=Decimal("1000"), cash=Decimal("1000"),
+        buying_power=Decimal("1000"), margin_used=Decimal("0"),
+        positions={}, orders=deque(), trades=deque(),
+    )
+    fields.update(overrides)
+    return AccountInfo(**fields)
+
+
+class TestAccountInfo:
+    """测试账户信息的字段类型与有界队列"""
+    
+    def test_orders_and_trades_are_capped(self):
+        orders = deque(range(AccountInfo.MAX_ORDERS + 5))
+        account = make_account(orders=orders)
+        assert account.orders.maxlen == AccountInfo.MAX_ORDERS
+        assert account.orders[0] == 5
+        assert account.trades.maxlen == AccountInfo.MAX_TRADES
+    
+    def test_capped_deque_is_kept(self):
+        orders = deque(maxlen=AccountInfo.MAX_ORDERS)
+        assert make_account(orders=orders).orders is orders
+    
+    @pytest.mark.parametrize("field, value", [
+        ("positions", []),
+        ("orders", []),
+        ("trades", ()),
+    ])
+    def test_rejects_mismatched_types(self, field, value):
+        with pytest.raises(TypeError, match=field):
+            make_account(**{field: value})